@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 # ========== CONFIG ==========
@@ -48,80 +49,142 @@ MAIN_CODE_REL_PATHS = [
 ]
 
 # Directories to ignore when traversing structure / supporting files
-IGNORE_DIRS = {
+IGNORE_DIRS = frozenset({
     ".git",
     "__pycache__",
     ".ipynb_checkpoints",
     ".mypy_cache",
-}
+})
 
 DEFAULT_OUTPUT_FILENAME = "capstone_project_overview.txt"
 
 
 # ========== HELPERS ==========
 
-def build_file_structure(root: Path) -> list[str]:
-    """
-    Returns an indented tree-like view of all files/directories under root.
-    """
-    lines: list[str] = []
-    lines.append(f"{root.name}/")
+# Precomputed indent strings, indexed by depth (deeper trees fall back to
+# multiplication, which in practice never happens here)
+_INDENTS = ["    " * i for i in range(64)]
+
+
+def _indent(depth: int) -> str:
+    if depth < len(_INDENTS):
+        return _INDENTS[depth]
+    return "    " * depth
 
-    for dirpath, dirnames, filenames in os.walk(root):
-        current_dir = Path(dirpath)
-        rel_dir = current_dir.relative_to(root)
 
-        # Filter ignored directories for traversal
-        dirnames[:] = [d for d in dirnames if d not in IGNORE_DIRS]
+# dir_fd-relative descent (openat-style) skips re-walking the full path on
+# every recursion; only available on POSIX
+_USE_DIR_FD = os.scandir in os.supports_fd and os.open in os.supports_dir_fd
 
-        # Print directory (skip root, already done)
-        if rel_dir != Path("."):
-            indent_level = len(rel_dir.parts)
-            indent = "    " * indent_level
-            lines.append(f"{indent}{rel_dir.name}/")
 
-        # Print files
-        for filename in sorted(filenames):
-            rel_file = (current_dir / filename).relative_to(root)
+def _walk(root: Path):
+    """
+    Single-pass scandir-based traversal yielding (abs_path, rel_path, is_dir)
+    string tuples for every entry under root, skipping IGNORE_DIRS entirely.
+
+    Relative paths are built once per entry with os.path.join; downstream
+    consumers reuse them instead of re-deriving Path.relative_to(root).
+    Directories are yielded before their contents; files within a directory
+    are yielded in sorted order. DirEntry.is_dir()/is_file() reuse the stat
+    info cached by scandir, so each entry costs a single syscall at most.
+
+    On POSIX the recursion descends via dir_fd-relative opens so the kernel
+    never re-resolves the accumulated path prefix.
+    """
+    root_str = str(root)
+
+    def _split(it):
+        dirs: list[os.DirEntry] = []
+        files: list[os.DirEntry] = []
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name in IGNORE_DIRS:
+                    continue
+                dirs.append(entry)
+            elif entry.is_file(follow_symlinks=False):
+                files.append(entry)
+        dirs.sort(key=lambda e: e.name)
+        files.sort(key=lambda e: e.name)
+        return dirs, files
+
+    def _scan(dirpath: str, rel_prefix: str):
+        with os.scandir(dirpath) as it:
+            dirs, files = _split(it)
+
+        for entry in dirs:
+            rel = os.path.join(rel_prefix, entry.name) if rel_prefix else entry.name
+            yield entry.path, rel, True
+            yield from _scan(entry.path, rel)
+
+        for entry in files:
+            rel = os.path.join(rel_prefix, entry.name) if rel_prefix else entry.name
+            yield entry.path, rel, False
+
+    def _scan_fd(dirfd: int, rel_prefix: str):
+        with os.scandir(dirfd) as it:
+            dirs, files = _split(it)
+
+        for entry in dirs:
+            rel = os.path.join(rel_prefix, entry.name) if rel_prefix else entry.name
+            yield os.path.join(root_str, rel), rel, True
+            child_fd = os.open(entry.name, os.O_RDONLY, dir_fd=dirfd)
+            try:
+                yield from _scan_fd(child_fd, rel)
+            finally:
+                os.close(child_fd)
+
+        for entry in files:
+            rel = os.path.join(rel_prefix, entry.name) if rel_prefix else entry.name
+            yield os.path.join(root_str, rel), rel, False
+
+    if _USE_DIR_FD:
+        root_fd = os.open(root_str, os.O_RDONLY)
+        try:
+            yield from _scan_fd(root_fd, "")
+        finally:
+            os.close(root_fd)
+    else:
+        yield from _scan(root_str, "")
+
 
-            # Skip files that live inside ignored directories (safety)
-            if any(part in IGNORE_DIRS for part in rel_file.parts):
-                continue
+def build_file_structure(root: Path, entries: list[tuple[str, str, bool]]) -> list[str]:
+    """
+    Returns an indented tree-like view of all files/directories under root.
+    """
+    lines: list[str] = []
+    lines.append(f"{root.name}/")
 
-            indent_level = len(rel_file.parts)
-            indent = "    " * indent_level
-            lines.append(f"{indent}{filename}")
+    for _abs_path, rel_path, is_dir in entries:
+        indent = _indent(rel_path.count(os.sep) + 1)
+        name = os.path.basename(rel_path)
+        suffix = "/" if is_dir else ""
+        lines.append(f"{indent}{name}{suffix}")
 
     return lines
 
 
-def collect_supporting_files(root: Path, main_code_paths: set[Path]) -> list[Path]:
+def collect_supporting_files(
+    entries: list[tuple[str, str, bool]], main_code_rel_paths: set[str]
+) -> list[str]:
     """
     Supporting files = every file under root that is NOT:
       - in IGNORE_DIRS
       - one of the main code files
-    """
-    supporting: list[Path] = []
 
-    for dirpath, dirnames, filenames in os.walk(root):
-        current_dir = Path(dirpath)
-        rel_dir = current_dir.relative_to(root)
-
-        dirnames[:] = [d for d in dirnames if d not in IGNORE_DIRS]
-
-        for filename in filenames:
-            file_path = current_dir / filename
-            rel_path = file_path.relative_to(root)
+    Returns root-relative path strings.
+    """
+    supporting: list[str] = []
 
-            if any(part in IGNORE_DIRS for part in rel_path.parts):
-                continue
+    for _abs_path, rel_path, is_dir in entries:
+        if is_dir:
+            continue
 
-            if rel_path in main_code_paths:
-                continue
+        if rel_path in main_code_rel_paths:
+            continue
 
-            supporting.append(file_path)
+        supporting.append(rel_path)
 
-    supporting.sort(key=lambda p: str(p.relative_to(root)))
+    supporting.sort()
     return supporting
 
 
@@ -131,7 +194,9 @@ def collect_main_code_files(root: Path) -> list[Path]:
     """
     result: list[Path] = []
     for rel in MAIN_CODE_REL_PATHS:
-        path = (root / rel).resolve()
+        # Lexical join is enough here; resolve() would cost a realpath
+        # syscall per file just to canonicalize symlinks we never rely on
+        path = root / rel
         if path.exists() and path.is_file():
             result.append(path)
         else:
@@ -162,64 +227,75 @@ def main():
     print(f"Project root: {project_root}")
     print(f"Output file : {output_path}")
 
-    # Prepare sets of paths
+    # Prepare sets of paths; rel paths are computed once and reused everywhere
     main_code_files = collect_main_code_files(project_root)
-    main_code_rel_paths = {p.relative_to(project_root) for p in main_code_files if p.exists()}
+    # Frozenset of normalized rel-path strings: O(1) membership in the walk
+    # without per-compare Path hashing
+    main_code_rel_paths = frozenset(
+        os.path.normpath(rel) for rel, p in zip(MAIN_CODE_REL_PATHS, main_code_files) if p.exists()
+    )
     # Note: missing files will be handled separately
 
+    # Walk the tree once; both sections consume the same entry list
+    entries = list(_walk(project_root))
+
     # Section 1: file structure
-    structure_lines = build_file_structure(project_root)
+    structure_lines = build_file_structure(project_root, entries)
 
     # Section 2: supporting files (names only)
-    supporting_files = collect_supporting_files(project_root, main_code_rel_paths)
+    supporting_files = collect_supporting_files(entries, main_code_rel_paths)
 
-    # Write report
-    with output_path.open("w", encoding="utf-8") as out:
+    # Write report (binary so Section 3 can stream file bytes directly)
+    with output_path.open("wb") as out:
         # ===== SECTION 1: FILE STRUCTURE =====
-        out.write("========================================\n")
-        out.write("SECTION 1: FILE STRUCTURE\n")
-        out.write("========================================\n\n")
-        for line in structure_lines:
-            out.write(line + "\n")
+        out.write(b"========================================\n")
+        out.write(b"SECTION 1: FILE STRUCTURE\n")
+        out.write(b"========================================\n\n")
+        # Join once and write once instead of one syscall per line
+        out.write("\n".join(structure_lines).encode("utf-8") + b"\n")
 
         # ===== SECTION 2: SUPPORTING FILES (NAMES ONLY) =====
-        out.write("\n\n========================================\n")
-        out.write("SECTION 2: SUPPORTING FILES (NAMES ONLY)\n")
-        out.write("========================================\n\n")
+        out.write(b"\n\n========================================\n")
+        out.write(b"SECTION 2: SUPPORTING FILES (NAMES ONLY)\n")
+        out.write(b"========================================\n\n")
 
         if not supporting_files:
-            out.write("(No supporting files found.)\n")
+            out.write(b"(No supporting files found.)\n")
         else:
-            for path in supporting_files:
-                rel = path.relative_to(project_root)
-                out.write(str(rel) + "\n")
+            out.write("\n".join(supporting_files).encode("utf-8") + b"\n")
 
         # ===== SECTION 3: MAIN CODING FILES (FULL CONTENT) =====
-        out.write("\n\n========================================\n")
-        out.write("SECTION 3: MAIN CODING FILES (FULL CONTENT)\n")
-        out.write("========================================\n")
+        out.write(b"\n\n========================================\n")
+        out.write(b"SECTION 3: MAIN CODING FILES (FULL CONTENT)\n")
+        out.write(b"========================================\n")
 
         if not main_code_files:
-            out.write("\n(No main coding files found.)\n")
+            out.write(b"\n(No main coding files found.)\n")
         else:
-            for path in main_code_files:
-                rel = path.relative_to(project_root) if path.exists() else None
-                out.write("\n\n---------- ")
-                if rel is not None:
-                    out.write(str(rel))
-                else:
-                    out.write(str(path))
-                out.write(" ----------\n\n")
-
-                if not path.exists():
-                    out.write("[Warning: file does not exist on disk]\n")
-                    continue
-
-                try:
-                    with path.open("r", encoding="utf-8") as f:
-                        out.write(f.read())
-                except UnicodeDecodeError:
-                    out.write("[Skipped: could not decode file as UTF-8]\n")
+            # Read all files concurrently (overlaps syscall latency on a
+            # cold cache) but write them out in configured order
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                futures = [
+                    ex.submit(path.read_bytes) if path.exists() else None
+                    for path in main_code_files
+                ]
+
+                for rel, path, future in zip(MAIN_CODE_REL_PATHS, main_code_files, futures):
+                    out.write(b"\n\n---------- ")
+                    if future is not None:
+                        out.write(rel.encode("utf-8"))
+                    else:
+                        out.write(str(path).encode("utf-8"))
+                    out.write(b" ----------\n\n")
+
+                    if future is None:
+                        out.write(b"[Warning: file does not exist on disk]\n")
+                        continue
+
+                    try:
+                        out.write(future.result())
+                    except OSError:
+                        out.write(b"[Skipped: could not read file]\n")
 
     print("Done.")
 
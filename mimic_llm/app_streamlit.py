@@ -1,7 +1,6 @@
 import os
 import sys
 import json
-import pandas as pd
 import streamlit as st
 
 # Wire project root
@@ -9,22 +8,14 @@ PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-from paths import COHORT_META_DIR
-from features import load_all_tables_for_stay
-from eval import compare_summaries  # Import for live metric calculation
-from visuals import (
-    render_medications_visuals,
-    render_measurements_visuals,
-    render_outputs_visuals,
-    render_labs_visuals,
-    render_admission_table,
-    render_diagnoses_table,
-    render_hosp_procedures_table,
-    render_icu_procedureevents_table,
-)
-
-# Load the precomputed JSON
+# Heavy deps (pandas, features -> pyarrow, eval -> transformers/BERTScore,
+# visuals -> matplotlib) are imported lazily inside the branches that use
+# them so the first page render only pays for json + streamlit.
+
+# Precomputed summaries: Parquet store (per-stay random access) with the
+# legacy JSON file as fallback
 PRECOMPUTED_PATH = os.path.join(PROJECT_ROOT, "precomputed_cohort_summaries.json")
+PRECOMPUTED_PARQUET = os.path.join(PROJECT_ROOT, "precomputed_cohort_summaries.parquet")
 
 # Define available view options
 VIEW_LABELS = {
@@ -39,28 +30,70 @@ VIEW_LABELS = {
 }
 VIEW_KEYS = {v: k for k, v in VIEW_LABELS.items()}
 
-@st.cache_data
+@st.cache_resource
+def _load_precomputed_json(path, mtime, size):
+    # mtime/size are part of the cache key so the JSON is only re-parsed
+    # when the file on disk actually changes, not on every cache reset
+    with open(path, "rb") as f:
+        return json.loads(f.read())
+
 def load_precomputed_data():
     if not os.path.exists(PRECOMPUTED_PATH):
         return {}
-    with open(PRECOMPUTED_PATH, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    return data
+    stat = os.stat(PRECOMPUTED_PATH)
+    return _load_precomputed_json(PRECOMPUTED_PATH, stat.st_mtime, stat.st_size)
+
+@st.cache_data
+def load_available_stay_ids():
+    """Sorted stay_ids, reading only the stay_id column of the Parquet store.
+
+    Cached so the per-rerun sidebar render never re-casts or re-sorts keys.
+    """
+    if os.path.exists(PRECOMPUTED_PARQUET):
+        import pyarrow.parquet as pq
+        table = pq.read_table(PRECOMPUTED_PARQUET, columns=["stay_id"])
+        return sorted(table.column("stay_id").to_pylist())
+    import numpy as np
+    ids = np.fromiter(map(int, load_precomputed_data().keys()), dtype=np.int64)
+    ids.sort()
+    return ids.tolist()
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def load_raw_stay_data(stay_id: int):
+    """Memoized raw-table load so widget interactions don't re-read Parquet."""
+    from features import load_all_tables_for_stay
+    return load_all_tables_for_stay(stay_id)
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def cached_compare_summaries(txt_a: str, txt_b: str, reference: str):
+    """Memoized metric computation; keyed on the three input strings so
+    toggling unrelated widgets never reruns the BERTScore/embedding models."""
+    from eval import compare_summaries
+    return compare_summaries(txt_a, txt_b, reference)
+
+@st.cache_data(max_entries=32)
+def load_stay_record(stay_id: int):
+    """Load one stay's precomputed record without parsing the whole cohort."""
+    if os.path.exists(PRECOMPUTED_PARQUET):
+        import pyarrow.dataset as ds
+        dataset = ds.dataset(PRECOMPUTED_PARQUET, format="parquet")
+        rows = dataset.to_table(filter=ds.field("stay_id") == stay_id)
+        if rows.num_rows == 0:
+            return None
+        return json.loads(rows.column("record_json")[0].as_py())
+    return load_precomputed_data().get(str(stay_id))
 
 def main():
     st.set_page_config(layout="wide") # Crucial for split screen
     st.title("ICU Discharge Summary Assistant")
 
-    # 1. Load Data
-    precomputed = load_precomputed_data()
-    
-    if not precomputed:
+    # 1. Load Data (stay list only; records are fetched per stay)
+    available_stays = load_available_stay_ids()
+
+    if not available_stays:
         st.error(f"Precomputed summaries file not found at: {PRECOMPUTED_PATH}. Please run scripts/precompute_summaries.py first.")
         return
 
-    # Dropdown for Stay ID
-    available_stays = sorted([int(k) for k in precomputed.keys()])
-    
     # Sidebar
     with st.sidebar:
         st.header("Patient Selection")
@@ -85,12 +118,14 @@ def main():
         show_ground_truth = st.checkbox("Show Actual Discharge Note", value=True)
 
     # Get data for selected stay
-    stay_record = precomputed.get(str(selected_stay_id))
-    
+    stay_record = load_stay_record(int(selected_stay_id))
+
     # We still need to load the raw tables for Visuals (from disk)
     # This is fast enough to do on-demand (Parquet read)
     try:
-        raw_stay_data = load_all_tables_for_stay(selected_stay_id)
+        import pandas as pd
+
+        raw_stay_data = load_raw_stay_data(int(selected_stay_id))
         icu_intime = None
         if not raw_stay_data["icu"]["icustays"].empty:
              icu_intime = pd.to_datetime(raw_stay_data["icu"]["icustays"].iloc[0]["intime"])
@@ -126,7 +161,8 @@ def main():
             st.markdown("---")
             st.markdown("### 📄 Actual Discharge Note (Ground Truth)")
             discharge_text = stay_record.get("discharge_text", "")
-            st.markdown(f"```\n{discharge_text}\n```")
+            # st.code skips the markdown tokenizer entirely on long notes
+            st.code(discharge_text, language=None)
 
     # === RIGHT COLUMN: DRILL-DOWN VIEW ===
     with right_col:
@@ -151,6 +187,17 @@ def main():
             
         # --- MERGED TAB: METRICS + VISUALS ---
         with v_tab3:
+            from visuals import (
+                render_medications_visuals,
+                render_measurements_visuals,
+                render_outputs_visuals,
+                render_labs_visuals,
+                render_admission_table,
+                render_diagnoses_table,
+                render_hosp_procedures_table,
+                render_icu_procedureevents_table,
+            )
+
             # 1. Metrics Section (LIVE CALCULATION)
             st.markdown("#### Evaluation Metrics")
             
@@ -165,7 +212,7 @@ def main():
                 txt_flan = v_flan
                 txt_med = v_med
 
-            live_metrics = compare_summaries(txt_flan, txt_med, discharge_text)
+            live_metrics = cached_compare_summaries(txt_flan, txt_med, discharge_text)
             f_m = live_metrics["flan"]
             m_m = live_metrics["meditron"]
                 
@@ -12,7 +12,11 @@ three forced stay_ids.
 
 import os
 import sys
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 # --- wire up project root and paths.py ---
 
@@ -30,80 +34,98 @@ def main():
     cohort_path = os.path.join(COHORT_META_DIR, "cohort_icu_250.parquet")
     discharge_path = os.path.join(NOTES_PROC_DIR, "discharge_clean.parquet")
 
-    print("Reading cohort from      :", cohort_path)
-    print("Reading discharge from   :", discharge_path)
-
-    cohort = pd.read_parquet(cohort_path)
-    discharge = pd.read_parquet(discharge_path)
-
-    if "hadm_id" not in cohort.columns:
-        raise ValueError("cohort_icu_250.parquet must contain 'hadm_id' column.")
-    if "hadm_id" not in discharge.columns or "note_id" not in discharge.columns:
+    # Accumulate report lines and flush stdout once at the end
+    lines = []
+    report = lines.append
+
+    report(f"Reading cohort from      : {cohort_path}")
+    report(f"Reading discharge from   : {discharge_path}")
+
+    # Only the ID columns are needed; Parquet is columnar so projecting
+    # here skips reading the wide text/metadata columns entirely. The
+    # columns stay in Arrow so the hot set operations run on Arrow's
+    # vectorized compute kernels rather than pandas objects.
+    try:
+        cohort = pq.read_table(cohort_path, columns=["stay_id", "hadm_id"])
+    except (KeyError, pa.ArrowInvalid):
+        raise ValueError("cohort_icu_250.parquet must contain 'stay_id' and 'hadm_id' columns.")
+    try:
+        discharge = pq.read_table(discharge_path, columns=["hadm_id", "note_id"])
+    except (KeyError, pa.ArrowInvalid):
         raise ValueError("discharge_clean.parquet must contain 'hadm_id' and 'note_id' columns.")
 
     # --- basic cohort stats ---
-    n_stays = cohort["stay_id"].nunique()
-    n_hadm  = cohort["hadm_id"].nunique()
-    print(f"\nCohort summary:")
-    print(f"- Unique stay_id in cohort : {n_stays}")
-    print(f"- Unique hadm_id in cohort : {n_hadm}")
-
-    cohort_hadm_ids = set(cohort["hadm_id"].unique())
-
-    # --- restrict discharge to only those hadm_id present in cohort ---
-    disc_cohort = discharge[discharge["hadm_id"].isin(cohort_hadm_ids)].copy()
-
-    # counts of discharge notes per hadm_id within the cohort
-    notes_per_hadm = (
-        disc_cohort.groupby("hadm_id")["note_id"]
-        .nunique()
-        .rename("n_discharge_notes")
+    n_stays = pc.count_distinct(cohort["stay_id"]).as_py()
+    n_hadm  = pc.count_distinct(cohort["hadm_id"]).as_py()
+    report(f"\nCohort summary:")
+    report(f"- Unique stay_id in cohort : {n_stays}")
+    report(f"- Unique hadm_id in cohort : {n_hadm}")
+
+    cohort_hadm_ids = pc.unique(cohort["hadm_id"])
+
+    # --- count discharge notes per cohort hadm_id in one pass ---
+    # note_id is unique per row in discharge_clean, so a row count per
+    # hadm_id equals the distinct-note count. is_in/value_counts are
+    # Arrow's hash kernels; pandas only sees the small per-hadm result.
+    mask = pc.is_in(discharge["hadm_id"], value_set=cohort_hadm_ids)
+    vc = pc.value_counts(discharge["hadm_id"].filter(mask).combine_chunks())
+    notes_per_hadm = pd.Series(
+        vc.field("counts").to_numpy(),
+        index=vc.field("values").to_numpy(),
+        name="n_discharge_notes",
     )
 
     n_with_notes = len(notes_per_hadm)
     n_without_notes = len(cohort_hadm_ids) - n_with_notes
 
-    print("\nDischarge note counts for cohort hadm_id:")
-    print(f"- hadm_id with ≥1 discharge note : {n_with_notes}")
-    print(f"- hadm_id with 0 discharge note  : {n_without_notes}")
+    report("\nDischarge note counts for cohort hadm_id:")
+    report(f"- hadm_id with ≥1 discharge note : {n_with_notes}")
+    report(f"- hadm_id with 0 discharge note  : {n_without_notes}")
 
     # Split by exact count
     hadm_eq_1 = notes_per_hadm[notes_per_hadm == 1]
     hadm_gt_1 = notes_per_hadm[notes_per_hadm > 1]
 
-    print(f"- hadm_id with exactly 1 note    : {len(hadm_eq_1)}")
-    print(f"- hadm_id with >1 notes          : {len(hadm_gt_1)}")
+    report(f"- hadm_id with exactly 1 note    : {len(hadm_eq_1)}")
+    report(f"- hadm_id with >1 notes          : {len(hadm_gt_1)}")
 
     if n_without_notes == 0 and len(hadm_gt_1) == 0:
-        print("\n✅ All hadm_id in cohort_icu_250 have EXACTLY ONE discharge summary.")
+        report("\n✅ All hadm_id in cohort_icu_250 have EXACTLY ONE discharge summary.")
     else:
-        print("\n❌ Inconsistency detected:")
+        report("\n❌ Inconsistency detected:")
         if n_without_notes > 0:
-            print(f"  - {n_without_notes} cohort hadm_id have 0 discharge notes.")
+            report(f"  - {n_without_notes} cohort hadm_id have 0 discharge notes.")
         if len(hadm_gt_1) > 0:
-            print(f"  - {len(hadm_gt_1)} cohort hadm_id have >1 discharge notes.")
-            print("    Example offending hadm_id → count:")
-            print(hadm_gt_1.head(10).to_string())
+            report(f"  - {len(hadm_gt_1)} cohort hadm_id have >1 discharge notes.")
+            report("    Example offending hadm_id → count:")
+            report(hadm_gt_1.head(10).to_string())
 
     # --- Check the forced stay_ids explicitly ---
-    print("\nForced stay_ids check:")
-    missing_forced = [s for s in FORCED_STAY_IDS if s not in set(cohort['stay_id'])]
+    report("\nForced stay_ids check:")
+    # Vectorized containment: avoids rebuilding a Python set of the whole
+    # stay_id column for each forced id
+    forced_arr = pa.array(FORCED_STAY_IDS, type=cohort["stay_id"].type)
+    forced_present = pc.is_in(forced_arr, value_set=cohort["stay_id"]).to_pylist()
+    missing_forced = [s for s, ok in zip(FORCED_STAY_IDS, forced_present) if not ok]
     if missing_forced:
-        print(f"❌ These forced stay_id are NOT present in cohort: {missing_forced}")
+        report(f"❌ These forced stay_id are NOT present in cohort: {missing_forced}")
     else:
-        print(f"✅ All forced stay_ids are present in cohort: {FORCED_STAY_IDS}")
+        report(f"✅ All forced stay_ids are present in cohort: {FORCED_STAY_IDS}")
 
     # Map forced stay_ids → hadm_id and their discharge note counts
-    forced_rows = cohort[cohort["stay_id"].isin(FORCED_STAY_IDS)].copy()
+    forced_rows = cohort.filter(
+        pc.is_in(cohort["stay_id"], value_set=forced_arr)
+    ).to_pandas()
     for s in FORCED_STAY_IDS:
         rows = forced_rows[forced_rows["stay_id"] == s]
         if rows.empty:
             continue
         hadm = int(rows.iloc[0]["hadm_id"])
         n_notes = int(notes_per_hadm.get(hadm, 0))
-        print(f"- stay_id {s} → hadm_id {hadm}, discharge note count: {n_notes}")
+        report(f"- stay_id {s} → hadm_id {hadm}, discharge note count: {n_notes}")
 
-    print("\nDone.")
+    report("\nDone.")
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 if __name__ == "__main__":
@@ -2,7 +2,11 @@
 
 import os
 import sys
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 # --- Wire up project root / paths.py ---
 SCRIPT_DIR   = os.path.dirname(os.path.abspath(__file__))
@@ -26,13 +30,21 @@ def check_icustays_mapping():
     """
     icu_path = os.path.join(ICU_PROC_DIR, "icustays_clean.parquet")
     print(f"Reading icustays_clean from: {icu_path}")
-    icu = pd.read_parquet(icu_path)
+    # Project only the three ID columns; the Parquet footer lets the
+    # reader skip every other column chunk entirely. The table stays in
+    # Arrow so the uniqueness checks run on vectorized C++ kernels with
+    # no pandas BlockManager materialization.
+    # memory_map lets uncompressed column chunks be paged straight from
+    # the file instead of copied into fresh allocations
+    icu = pq.read_table(
+        icu_path, columns=["stay_id", "hadm_id", "subject_id"], memory_map=True
+    )
 
     # --- Basic stats ---
-    total_rows        = len(icu)
-    n_stay_ids        = icu["stay_id"].nunique()
-    n_hadm_ids        = icu["hadm_id"].nunique()
-    n_subject_ids     = icu["subject_id"].nunique()
+    total_rows        = icu.num_rows
+    n_stay_ids        = pc.count_distinct(icu["stay_id"]).as_py()
+    n_hadm_ids        = pc.count_distinct(icu["hadm_id"]).as_py()
+    n_subject_ids     = pc.count_distinct(icu["subject_id"]).as_py()
 
     print("\n=== Basic stats for icustays_clean ===")
     print(f"Total rows              : {total_rows}")
@@ -41,38 +53,58 @@ def check_icustays_mapping():
     print(f"Unique subject_id       : {n_subject_ids}")
 
     # --- stay_id -> hadm_id mapping check ---
-    counts_stay_to_hadm = icu.groupby("stay_id")["hadm_id"].nunique()
-    bad_stay = counts_stay_to_hadm[counts_stay_to_hadm > 1].sort_values(ascending=False)
+    # One hash pass over the deduplicated (stay_id, hadm_id) pairs replaces
+    # two groupby(...).nunique() passes: a stay_id appearing more than once
+    # among unique pairs maps to multiple hadm_id (and vice versa).
+    pairs = icu.select(["stay_id", "hadm_id"]).group_by(["stay_id", "hadm_id"]).aggregate([])
+    n_pairs = pairs.num_rows
 
     print("\n=== stay_id → hadm_id mapping ===")
-    print(f"Total unique stay_id                : {counts_stay_to_hadm.shape[0]}")
-    print(f"stay_id with >1 hadm_id             : {bad_stay.shape[0]}")
+    print(f"Total unique stay_id                : {n_stay_ids}")
 
-    if bad_stay.empty:
+    # Cheap short-circuit: if the number of unique pairs equals the number
+    # of unique stay_id, no stay can map to two admissions, so the
+    # per-key value_counts never needs to run on clean data
+    if n_pairs == n_stay_ids:
+        print(f"stay_id with >1 hadm_id             : 0")
         print("✅ All stay_id map to exactly one hadm_id in icustays_clean.")
     else:
+        vc = pc.value_counts(pairs["stay_id"].combine_chunks())
+        stay_pair_counts = pd.Series(
+            vc.field("counts").to_numpy(), index=vc.field("values").to_numpy()
+        )
+        bad_stay = stay_pair_counts[stay_pair_counts > 1].sort_values(ascending=False)
+        print(f"stay_id with >1 hadm_id             : {bad_stay.shape[0]}")
         print("❌ Found stay_id with multiple hadm_id. Top few:")
         print(bad_stay.head())
         bad_ids = bad_stay.index.tolist()
         print("\nExample offending rows from icustays_clean:")
-        print(
-            icu[icu["stay_id"].isin(bad_ids)]
-            .sort_values(["stay_id", "hadm_id"])
-            .head(50)
-        )
+        # split_blocks avoids consolidating columns into 2-D blocks and
+        # self_destruct releases each Arrow buffer as it converts
+        offending = icu.filter(
+            pc.is_in(icu["stay_id"], value_set=pa.array(bad_ids, type=icu["stay_id"].type))
+        ).to_pandas(split_blocks=True, self_destruct=True)
+        print(offending.sort_values(["stay_id", "hadm_id"]).head(50))
 
     # --- hadm_id repetition summary ---
     # Here each row is an ICU stay. So if unique hadm_id < total_rows,
     # some hadm_id appear in multiple rows (multiple ICU stays per admission).
-    hadm_counts = icu.groupby("hadm_id")["stay_id"].nunique()
-    hadm_with_multiple_stays = hadm_counts[hadm_counts > 1]
-
     print("\n=== hadm_id repetition (across rows / ICU stays) ===")
-    print(f"hadm_id appearing in >1 row (ICU stays): {hadm_with_multiple_stays.shape[0]}")
 
-    if not hadm_with_multiple_stays.empty:
-        print("Example hadm_id with multiple ICU stays:")
-        print(hadm_with_multiple_stays.sort_values(ascending=False).head())
+    # Same short-circuit in the other direction
+    if n_pairs == n_hadm_ids:
+        print("hadm_id appearing in >1 row (ICU stays): 0")
+    else:
+        vc_hadm = pc.value_counts(pairs["hadm_id"].combine_chunks())
+        hadm_counts = pd.Series(
+            vc_hadm.field("counts").to_numpy(), index=vc_hadm.field("values").to_numpy()
+        )
+        hadm_with_multiple_stays = hadm_counts[hadm_counts > 1]
+        print(f"hadm_id appearing in >1 row (ICU stays): {hadm_with_multiple_stays.shape[0]}")
+
+        if not hadm_with_multiple_stays.empty:
+            print("Example hadm_id with multiple ICU stays:")
+            print(hadm_with_multiple_stays.sort_values(ascending=False).head())
 
 def main():
     check_icustays_mapping()
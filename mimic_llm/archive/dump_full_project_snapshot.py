@@ -10,6 +10,10 @@ Important: All .py files under mimic_llm/archive/ are treated as supporting only
 Their code is NOT copied into Section 3.
 """
 
+import json
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
@@ -24,6 +28,10 @@ PROJECT_ROOT = Path(__file__).resolve().parent
 # Output file inside the project root
 OUTPUT_PATH = PROJECT_ROOT / "project_full_snapshot.txt"
 
+# Sidecar manifest recording the inputs of the last run, used to skip
+# regeneration when nothing changed
+MANIFEST_PATH = PROJECT_ROOT / "project_full_snapshot.manifest.json"
+
 
 # Supporting dirs at $HOME level (environment / setup, not core output)
 HOME_SUPPORTING_DIRS = [
@@ -56,13 +64,10 @@ PROJECT_SUPPORTING_FILES = [
 
 # ---- Helpers ----
 
-def is_under(path: Path, parent: Path) -> bool:
-    """Return True if path is somewhere under parent."""
-    try:
-        path.relative_to(parent)
-        return True
-    except ValueError:
-        return False
+# Precomputed prefix strings so containment checks are single C-level
+# str.startswith calls instead of exception-driven Path.relative_to
+ROOT_STR = str(PROJECT_ROOT) + os.sep
+ARCHIVE_STR = str(PROJECT_ROOT / "archive") + os.sep
 
 
 def is_main_code_file(path: Path) -> bool:
@@ -75,64 +80,102 @@ def is_main_code_file(path: Path) -> bool:
     - Must NOT be inside archive/.
     - Must NOT be inside __pycache__.
     """
-    if path.suffix != ".py":
-        return False
+    s = str(path)
+    return (
+        s.endswith(".py")
+        and s.startswith(ROOT_STR)
+        and not s.startswith(ARCHIVE_STR)
+        and "__pycache__" not in s.split(os.sep)
+    )
 
-    if not is_under(path, PROJECT_ROOT):
-        return False
 
-    # Exclude archive (supporting only)
-    if is_under(path, PROJECT_ROOT / "archive"):
-        return False
+# Directory names never descended into while collecting main code files
+EXCLUDED_DIR_NAMES = frozenset({"archive", "__pycache__"})
 
-    # Exclude any __pycache__ just in case
-    if "__pycache__" in path.parts:
-        return False
 
-    return True
+def collect_main_code_files():
+    """Find all main .py files in the project (excluding archive/).
 
+    Prefers `git ls-files` (a single process over git's mmapped index,
+    ignoring untracked noise); otherwise walks with os.scandir, pruning
+    excluded subtrees at the directory level so archive/ and __pycache__
+    are never even listed.
+    """
+    try:
+        tracked = subprocess.check_output(
+            ["git", "-C", str(PROJECT_ROOT), "ls-files", "*.py"],
+            text=True,
+            stderr=subprocess.DEVNULL,
+        )
+        # ls-files reports index entries, so a tracked-but-deleted file
+        # would crash the later stat/read; keep only files that exist,
+        # like the scandir fallback naturally does
+        files = [
+            (rel, PROJECT_ROOT / rel)
+            for rel in tracked.splitlines()
+            if not rel.startswith("archive/")
+            and "__pycache__" not in rel.split("/")
+            and (PROJECT_ROOT / rel).is_file()
+        ]
+        return sorted(files)
+    except (OSError, subprocess.CalledProcessError):
+        pass
 
-def collect_main_code_files():
-    """Find all main .py files in the project (excluding archive/)."""
     files = []
-    for p in PROJECT_ROOT.rglob("*.py"):
-        if is_main_code_file(p):
-            files.append(p)
+
+    def _scan(dirpath):
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in EXCLUDED_DIR_NAMES:
+                        _scan(entry.path)
+                elif entry.name.endswith(".py") and entry.is_file(follow_symlinks=False):
+                    # Slice off the root prefix once; the rel string is
+                    # reused for sorting and by both formatters
+                    files.append((entry.path[len(ROOT_STR):], Path(entry.path)))
+
+    _scan(str(PROJECT_ROOT))
     # Sort by relative path for stable ordering
-    return sorted(files, key=lambda p: str(p.relative_to(PROJECT_ROOT)))
+    return sorted(files)
 
 
 def collect_supporting_items():
-    """Collect supporting dirs/files (environment + project-level support)."""
-    items = []
+    """Collect supporting dirs/files (environment + project-level support).
+
+    Returns (path, is_dir) tuples; the dir/file flag is recorded at
+    collection time so the formatter never re-stats each path.
+    """
+    # str(path) -> (path, is_dir); dict preserves insertion order and
+    # dedupes in the same pass
+    items: dict = {}
 
     # Home-level supporting dirs
     for p in HOME_SUPPORTING_DIRS:
         if p.exists():
-            items.append(p)
+            items.setdefault(str(p), (p, True))
 
     # Project-level supporting dirs/files
-    for p in PROJECT_SUPPORTING_DIRS + PROJECT_SUPPORTING_FILES:
+    for p in PROJECT_SUPPORTING_DIRS:
         if p.exists():
-            items.append(p)
+            items.setdefault(str(p), (p, True))
+    for p in PROJECT_SUPPORTING_FILES:
+        if p.exists():
+            items.setdefault(str(p), (p, False))
 
     # Also list individual files inside archive/ as supporting
     archive_dir = PROJECT_ROOT / "archive"
     if archive_dir.exists():
-        for p in archive_dir.rglob("*"):
-            if p.is_file():
-                items.append(p)
+        def _scan(dirpath):
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        _scan(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        items.setdefault(entry.path, (Path(entry.path), False))
 
-    # De-duplicate
-    seen = set()
-    unique_items = []
-    for p in items:
-        s = str(p)
-        if s not in seen:
-            unique_items.append(p)
-            seen.add(s)
+        _scan(str(archive_dir))
 
-    return sorted(unique_items, key=str)
+    return sorted(items.values(), key=lambda item: str(item[0]))
 
 
 # ---- Formatting sections ----
@@ -148,10 +191,9 @@ def format_section_1(main_files):
     lines.append(f"Project root: {PROJECT_ROOT}")
     lines.append("")
 
-    for p in main_files:
-        rel = p.relative_to(PROJECT_ROOT)
+    for rel, _p in main_files:
         # e.g. "app_streamlit.py" or "scripts/make_cohort_icu_250.py"
-        lines.append(str(rel))
+        lines.append(rel)
 
     lines.append("")  # trailing blank line
     return "\n".join(lines)
@@ -168,40 +210,42 @@ def format_section_2(supporting_items):
     lines.append("These paths are environment/config/logging/archive/etc., not part of the final output.")
     lines.append("")
 
-    for p in supporting_items:
-        prefix = "DIR " if p.is_dir() else "FILE"
+    for p, is_dir in supporting_items:
+        prefix = "DIR " if is_dir else "FILE"
         lines.append(f"{prefix}: {p}")
 
     lines.append("")
     return "\n".join(lines)
 
 
-def format_section_3(main_files):
+def write_section_3(out, main_files):
     """
     Section 3: All the code in the coding files exactly copy pasted.
     Only includes main .py files (excludes archive/ by design).
-    """
-    lines = []
-    lines.append("SECTION 3: Full source code of main project files")
-    lines.append("")
 
-    for p in main_files:
-        rel = p.relative_to(PROJECT_ROOT)
-        lines.append("=" * 80)
-        lines.append(f"FILE: {rel}")
-        lines.append("=" * 80)
+    Streams each file straight into the open output handle instead of
+    accumulating the whole section as one giant string.
+    """
+    out.write("SECTION 3: Full source code of main project files\n\n")
 
-        try:
-            text = p.read_text(encoding="utf-8")
-        except UnicodeDecodeError:
-            # Fallback if there are unexpected encodings
-            text = p.read_text(errors="replace")
+    def _read(p):
+        # Single I/O pass + single decode; errors="replace" keeps the old
+        # fallback semantics without a second read on odd encodings
+        return p.read_bytes().decode("utf-8", errors="replace")
 
-        # Append the file contents exactly, without modification
-        lines.append(text)
-        lines.append("")  # blank line between files
+    # Read files in parallel (I/O releases the GIL, so threads overlap
+    # per-file open latency); ex.map yields results lazily in input
+    # order, so only a bounded number of files are resident at once
+    with ThreadPoolExecutor(max_workers=32) as ex:
+        texts = ex.map(_read, (p for _rel, p in main_files))
+        for (rel, p), text in zip(main_files, texts):
+            out.write("=" * 80 + "\n")
+            out.write(f"FILE: {rel}\n")
+            out.write("=" * 80 + "\n")
 
-    return "\n".join(lines)
+            # Write the file contents exactly, without modification
+            out.write(text)
+            out.write("\n\n")  # blank line between files
 
 
 # ---- Main ----
@@ -211,22 +255,38 @@ def main():
         raise SystemExit(f"Project root does not exist: {PROJECT_ROOT}")
 
     main_files = collect_main_code_files()
+
+    # Skip the whole dump when no main file changed since the last run
+    manifest = {}
+    for rel, p in main_files:
+        st = p.stat()
+        manifest[rel] = [st.st_mtime_ns, st.st_size]
+    if OUTPUT_PATH.exists() and MANIFEST_PATH.exists():
+        try:
+            previous = json.loads(MANIFEST_PATH.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            previous = None
+        if previous == manifest:
+            print(f"Snapshot unchanged, skipping: {OUTPUT_PATH}")
+            return
+
     supporting_items = collect_supporting_items()
 
     section1 = format_section_1(main_files)
     section2 = format_section_2(supporting_items)
-    section3 = format_section_3(main_files)
-
-    content = "\n".join([
-        section1,
-        "\n" + "-" * 80 + "\n",
-        section2,
-        "\n" + "-" * 80 + "\n",
-        section3,
-        "",
-    ])
-
-    OUTPUT_PATH.write_text(content, encoding="utf-8")
+
+    separator = "\n\n" + "-" * 80 + "\n\n"
+
+    # Stream the snapshot instead of concatenating every section in RAM;
+    # the big buffer keeps writes to a handful of syscalls
+    with open(OUTPUT_PATH, "w", encoding="utf-8", buffering=1 << 20) as out:
+        out.write(section1)
+        out.write(separator)
+        out.write(section2)
+        out.write(separator)
+        write_section_3(out, main_files)
+
+    MANIFEST_PATH.write_text(json.dumps(manifest), encoding="utf-8")
     print(f"Wrote snapshot to: {OUTPUT_PATH}")
 
 
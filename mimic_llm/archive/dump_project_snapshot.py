@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import os
+import shutil
 from pathlib import Path
 from datetime import datetime
 
@@ -79,36 +80,42 @@ def tree_lines(root: Path, max_depth: int = 3):
     """
     Return a list of lines representing a simple directory tree
     rooted at `root`, limited to `max_depth` levels.
+
+    Iterative scandir DFS: DirEntry reuses the type info cached from the
+    directory read (no stat or Path object per entry), which matters when
+    the tree covers bulky dirs like .cache/.vscode-server. Children are
+    pushed in reverse so emission order matches the old recursion.
     """
     lines = []
+    root_str = str(root)
+    if not os.path.exists(root_str):
+        lines.append(f"[MISSING] {root}")
+        return lines
 
-    def walk(path: Path, depth: int):
-        indent = "    " * depth
-        # Show directory name
-        if depth == 0:
-            lines.append(f"{path} /")
-        else:
-            lines.append(f"{indent}{path.name}/")
-
-        if depth >= max_depth:
-            return
+    # Work items are either a directory to expand or a pre-rendered line
+    stack = [("dir", root_str, 0, f"{root} /")]
+    while stack:
+        kind, payload, depth, label = stack.pop()
+        lines.append(label)
+        if kind != "dir" or depth >= max_depth:
+            continue
 
+        indent = "    " * depth
         try:
-            entries = sorted(path.iterdir(), key=lambda p: (p.is_file(), p.name.lower()))
+            with os.scandir(payload) as it:
+                entries = sorted(
+                    it,
+                    key=lambda e: (e.is_file(follow_symlinks=False), e.name.lower()),
+                )
         except (PermissionError, FileNotFoundError) as e:
             lines.append(f"{indent}  [Error reading directory: {e}]")
-            return
+            continue
 
-        for entry in entries:
-            if entry.is_dir():
-                walk(entry, depth + 1)
+        for entry in reversed(entries):
+            if entry.is_dir(follow_symlinks=False):
+                stack.append(("dir", entry.path, depth + 1, f"{indent}    {entry.name}/"))
             else:
-                lines.append(f"{indent}    {entry.name}")
-
-    if root.exists():
-        walk(root, 0)
-    else:
-        lines.append(f"[MISSING] {root}")
+                stack.append(("file", None, depth + 1, f"{indent}    {entry.name}"))
 
     return lines
 
@@ -171,8 +178,9 @@ def main():
                 out.write(f"\n----- BEGIN FILE: {path} -----\n")
                 try:
                     with path.open("r", encoding="utf-8", errors="replace") as f_in:
-                        for line in f_in:
-                            out.write(line)
+                        # Copy in 1 MiB chunks instead of a per-line loop:
+                        # a handful of big reads/writes per file
+                        shutil.copyfileobj(f_in, out, length=1 << 20)
                 except Exception as e:
                     out.write(f"[Error reading file {path}: {e}]\n")
                 out.write(f"\n----- END FILE: {path} -----\n")
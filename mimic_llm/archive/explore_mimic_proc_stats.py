@@ -15,10 +15,18 @@ WARNING: Some sections (labs, measurements) load very large tables.
 Run this on a compute node, not login, and comment out sections if needed.
 """
 
+import functools
+import io
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
 
 # ---------------------------------------------------------------------
 # Wire up project root and paths.py
@@ -30,6 +38,53 @@ if PROJECT_ROOT not in sys.path:
 
 from paths import HOSP_PROC_DIR, ICU_PROC_DIR, NOTES_PROC_DIR
 
+# Shared parent tables referenced by several questions
+ADM_PATH = os.path.join(HOSP_PROC_DIR, "patients_admissions_clean.parquet")
+ICU_PATH = os.path.join(ICU_PROC_DIR, "icustays_clean.parquet")
+
+
+@functools.lru_cache(maxsize=None)
+def load_unique_ids(path, key):
+    """Sorted unique values of one parquet column, memoized per (path, key).
+
+    Admissions / icustays are decoded at most once per process instead of
+    once per question.
+    """
+    # memory_map pages the column straight from the file (shared
+    # across pool workers via the page cache) and the column never
+    # round-trips through a pandas DataFrame
+    col = pq.read_table(path, columns=[key], memory_map=True)[key]
+    ids = pc.unique(col).to_numpy().astype(np.int32, copy=False)
+    # MIMIC hadm_id/stay_id fit comfortably in int32; halving the
+    # element width halves the bytes every later sort / hash /
+    # membership pass has to move
+    ids.sort()
+    return ids
+
+
+def meta_summary(col):
+    """(distinct count, first 5 example values) for a low-cardinality column.
+
+    Dictionary-encodes the column once (a no-op if Parquet already stored
+    it dictionary-encoded) so the count and the examples both come from
+    the already-deduplicated dictionary values instead of O(N) rescans.
+    """
+    col = col.combine_chunks()
+    if not pa.types.is_dictionary(col.type):
+        col = col.dictionary_encode()
+    values = [v for v in col.dictionary.to_pylist() if v is not None]
+    return len(values), values[:5]
+
+
+def diff_ids(all_ids: np.ndarray, present_ids: np.ndarray) -> np.ndarray:
+    """IDs in all_ids missing from present_ids.
+
+    np.isin with kind="table" takes the hash-table path instead of the
+    sort-based merge that np.setdiff1d would run on both arrays.
+    """
+    mask = np.isin(all_ids, present_ids, assume_unique=True, kind="table")
+    return all_ids[~mask]
+
 
 def print_section(title: str):
     print("\n" + "=" * 80)
@@ -38,47 +93,93 @@ def print_section(title: str):
 
 
 # ---------------------------------------------------------------------
-# Q1 – Diagnoses per hospital admission
+# Shared coverage kernel for the "does every parent id have child rows?"
+# questions (Q1, Q2, Q6, Q7, Q8). Each entry differs only in paths,
+# key column and wording, so the per-question functions are thin
+# wrappers and every optimization lands in one place.
 # ---------------------------------------------------------------------
-def q1_diagnoses():
-    """
-    1. For 546,028 hospital admissions:
-       - Does every hadm_id have at least 1 diagnosis?
-       - Or are there admissions with 0 diagnoses?
+def missing_ids_via_stats(parent_ids, child_path, key):
+    """Parent ids with no row in child_path, using footer statistics.
+
+    pyarrow cannot read Parquet bloom filters, so per-row-group min/max
+    statistics are the footer-only pruning available: a row group whose
+    [min, max] range contains none of the still-missing ids is skipped
+    without decoding, and the scan short-circuits as soon as every
+    parent id has been seen. parent_ids must be sorted and unique
+    (load_unique_ids guarantees both).
     """
+    pf = pq.ParquetFile(child_path)
+    key_idx = pf.schema_arrow.get_field_index(key)
+    missing = parent_ids
+    for rg in range(pf.num_row_groups):
+        if missing.shape[0] == 0:
+            break
+        stats = pf.metadata.row_group(rg).column(key_idx).statistics
+        if stats is not None and stats.has_min_max:
+            lo = np.searchsorted(missing, stats.min, side="left")
+            hi = np.searchsorted(missing, stats.max, side="right")
+            if lo == hi:
+                continue
+        present = (
+            pc.unique(pf.read_row_group(rg, columns=[key])[key])
+            .to_numpy()
+            .astype(np.int32, copy=False)
+        )
+        found = np.isin(missing, present, assume_unique=True, kind="table")
+        missing = missing[~found]
+    return missing
 
-    print_section("Q1: Diagnoses per hospital admission")
 
-    adm_path = os.path.join(HOSP_PROC_DIR, "patients_admissions_clean.parquet")
-    dx_path  = os.path.join(HOSP_PROC_DIR, "diagnoses_clean.parquet")
+def coverage_report(title, parent_path, parent_key, parent_desc, unit,
+                    child_path, child_name, meta_cols=()):
+    """Print coverage of parent ids by child rows plus optional meta stats."""
+    print_section(title)
 
-    adm = pd.read_parquet(adm_path, columns=["subject_id", "hadm_id"])
-    dx  = pd.read_parquet(dx_path,  columns=["subject_id", "hadm_id"])
+    parent_ids = load_unique_ids(parent_path, parent_key)
+    n_parent   = parent_ids.shape[0]
+    # Row count comes straight from the footer; no data pages are read
+    n_rows     = pq.ParquetFile(child_path).metadata.num_rows
 
-    n_hadm_total = adm["hadm_id"].nunique()
-    n_dx_rows    = len(dx)
+    missing = missing_ids_via_stats(parent_ids, child_path, parent_key)
 
-    # Which admissions have at least one diagnosis?
-    hadm_with_dx = dx["hadm_id"].unique()
-    hadm_all     = adm["hadm_id"].unique()
+    n_missing = missing.shape[0]
+    n_present = n_parent - n_missing
 
-    hadm_without_dx = np.setdiff1d(hadm_all, hadm_with_dx)
+    print(f"Total unique {parent_key} ({parent_desc}): {n_parent}")
+    print(f"Total {child_name} rows                   : {n_rows}")
+    print(f"Average {child_name} rows per {unit}      : {n_rows / n_parent:0.2f}")
+    print()
+    print(f"{parent_desc.capitalize()} with ≥1 {child_name} row : {n_present} "
+          f"({100.0 * n_present / n_parent:0.2f}%)")
+    print(f"{parent_desc.capitalize()} with 0 {child_name} rows : {n_missing} "
+          f"({100.0 * n_missing / n_parent:0.2f}%)")
 
-    n_with_dx    = hadm_with_dx.shape[0]
-    n_without_dx = hadm_without_dx.shape[0]
+    if meta_cols:
+        meta = pq.read_table(child_path, columns=list(meta_cols))
+        for col in meta_cols:
+            n_unique, examples = meta_summary(meta[col])
+            print(f"\nUnique {col} : {n_unique}")
+            print(f"Example {col} (5): {examples}")
+
+    if n_missing > 0:
+        print(f"\nExample {parent_key} with NO {child_name} rows:")
+        print(missing[:10])
 
-    print(f"Total unique hadm_id (hospital admissions): {n_hadm_total}")
-    print(f"Total diagnoses rows                       : {n_dx_rows}")
-    print(f"Average diagnoses per admission            : {n_dx_rows / n_hadm_total:0.2f}")
-    print()
-    print(f"Admissions with ≥1 diagnosis               : {n_with_dx} "
-          f"({100.0 * n_with_dx / n_hadm_total:0.2f}%)")
-    print(f"Admissions with 0 diagnoses                : {n_without_dx} "
-          f"({100.0 * n_without_dx / n_hadm_total:0.2f}%)")
 
-    if n_without_dx > 0:
-        print("\nExample hadm_id with NO diagnoses:")
-        print(hadm_without_dx[:10])
+# ---------------------------------------------------------------------
+# Q1 – Diagnoses per hospital admission
+# ---------------------------------------------------------------------
+def q1_diagnoses():
+    """
+    1. For 546,028 hospital admissions:
+       - Does every hadm_id have at least 1 diagnosis?
+       - Or are there admissions with 0 diagnoses?
+    """
+    coverage_report(
+        "Q1: Diagnoses per hospital admission",
+        ADM_PATH, "hadm_id", "hospital admissions", "admission",
+        os.path.join(HOSP_PROC_DIR, "diagnoses_clean.parquet"), "diagnoses",
+    )
 
 
 # ---------------------------------------------------------------------
@@ -90,37 +191,11 @@ def q2_hosp_procedures():
        - Does every hadm_id have at least 1 hospital procedure?
        - Or are there admissions with 0 procedures?
     """
-
-    print_section("Q2: HOSP Procedures per hospital admission")
-
-    adm_path  = os.path.join(HOSP_PROC_DIR, "patients_admissions_clean.parquet")
-    proc_path = os.path.join(HOSP_PROC_DIR, "procedures_clean.parquet")
-
-    adm  = pd.read_parquet(adm_path,  columns=["subject_id", "hadm_id"])
-    proc = pd.read_parquet(proc_path, columns=["subject_id", "hadm_id"])
-
-    n_hadm_total = adm["hadm_id"].nunique()
-    n_proc_rows  = len(proc)
-
-    hadm_with_proc = proc["hadm_id"].unique()
-    hadm_all       = adm["hadm_id"].unique()
-    hadm_without_proc = np.setdiff1d(hadm_all, hadm_with_proc)
-
-    n_with_proc    = hadm_with_proc.shape[0]
-    n_without_proc = hadm_without_proc.shape[0]
-
-    print(f"Total unique hadm_id (hospital admissions): {n_hadm_total}")
-    print(f"Total HOSP procedures rows                 : {n_proc_rows}")
-    print(f"Average HOSP procedures per admission      : {n_proc_rows / n_hadm_total:0.2f}")
-    print()
-    print(f"Admissions with ≥1 HOSP procedure          : {n_with_proc} "
-          f"({100.0 * n_with_proc / n_hadm_total:0.2f}%)")
-    print(f"Admissions with 0 HOSP procedures          : {n_without_proc} "
-          f"({100.0 * n_without_proc / n_hadm_total:0.2f}%)")
-
-    if n_without_proc > 0:
-        print("\nExample hadm_id with NO HOSP procedures:")
-        print(hadm_without_proc[:10])
+    coverage_report(
+        "Q2: HOSP Procedures per hospital admission",
+        ADM_PATH, "hadm_id", "hospital admissions", "admission",
+        os.path.join(HOSP_PROC_DIR, "procedures_clean.parquet"), "HOSP procedures",
+    )
 
 
 # ---------------------------------------------------------------------
@@ -137,29 +212,40 @@ def q3_lab_tests():
 
     print_section("Q3: Lab tests per hospital admission and lab meta")
 
-    adm_path = os.path.join(HOSP_PROC_DIR, "patients_admissions_clean.parquet")
     labs_path = os.path.join(HOSP_PROC_DIR, "lab_tests_clean.parquet")
 
-    adm = pd.read_parquet(adm_path, columns=["subject_id", "hadm_id"])
-    # Load only the columns we need from labs (still a huge table!)
-    labs = pd.read_parquet(
-        labs_path,
-        columns=[
-            "subject_id",
-            "hadm_id",
-            "lab_tests_label",
-            "lab_tests_fluid",
-            "lab_tests_category",
-        ],
+    # Stream the huge labs table batch by batch instead of materializing
+    # 158M rows in pandas; per-batch uniques are unioned incrementally so
+    # peak memory stays at one batch plus the (small) accumulators
+    meta_cols = ["lab_tests_label", "lab_tests_fluid", "lab_tests_category"]
+    scanner = ds.dataset(labs_path).scanner(
+        columns=["hadm_id"] + meta_cols, batch_size=1 << 20
     )
 
-    n_hadm_total = adm["hadm_id"].nunique()
-    n_lab_rows   = len(labs)
+    n_lab_rows = 0
+    hadm_seen: set = set()
+    # dicts double as insertion-ordered sets so the 5 example values keep
+    # first-seen order like the old drop_duplicates().head(5)
+    meta_seen = {col: {} for col in meta_cols}
+
+    for batch in scanner.to_batches():
+        n_lab_rows += batch.num_rows
+        # Many labevents rows have no hadm_id (labs outside an
+        # admission); drop the nulls so only real admissions count
+        hadm_seen.update(
+            pc.unique(pc.drop_null(batch.column("hadm_id"))).to_pylist()
+        )
+        for col in meta_cols:
+            for v in pc.unique(batch.column(col)).to_pylist():
+                if v is not None:
+                    meta_seen[col].setdefault(v)
+
+    hadm_all     = load_unique_ids(ADM_PATH, "hadm_id")
+    n_hadm_total = hadm_all.shape[0]
 
-    hadm_with_lab = labs["hadm_id"].unique()
-    hadm_all      = adm["hadm_id"].unique()
+    hadm_with_lab = np.fromiter(hadm_seen, dtype=np.int32, count=len(hadm_seen))
 
-    hadm_without_lab = np.setdiff1d(hadm_all, hadm_with_lab)
+    hadm_without_lab = diff_ids(hadm_all, hadm_with_lab)
 
     n_with_lab    = hadm_with_lab.shape[0]
     n_without_lab = hadm_without_lab.shape[0]
@@ -175,18 +261,18 @@ def q3_lab_tests():
 
     # Unique meta fields
     print("\nUnique counts for lab meta columns:")
-    print(f"- lab_tests_label    : {labs['lab_tests_label'].nunique()}")
-    print(f"- lab_tests_fluid    : {labs['lab_tests_fluid'].nunique()}")
-    print(f"- lab_tests_category : {labs['lab_tests_category'].nunique()}")
+    print(f"- lab_tests_label    : {len(meta_seen['lab_tests_label'])}")
+    print(f"- lab_tests_fluid    : {len(meta_seen['lab_tests_fluid'])}")
+    print(f"- lab_tests_category : {len(meta_seen['lab_tests_category'])}")
 
     print("\nExample lab_tests_label (5):")
-    print(labs["lab_tests_label"].dropna().drop_duplicates().head(5).tolist())
+    print(list(meta_seen["lab_tests_label"])[:5])
 
     print("\nExample lab_tests_fluid (5):")
-    print(labs["lab_tests_fluid"].dropna().drop_duplicates().head(5).tolist())
+    print(list(meta_seen["lab_tests_fluid"])[:5])
 
     print("\nExample lab_tests_category (5):")
-    print(labs["lab_tests_category"].dropna().drop_duplicates().head(5).tolist())
+    print(list(meta_seen["lab_tests_category"])[:5])
 
 
 # ---------------------------------------------------------------------
@@ -199,16 +285,11 @@ def q4_icu_vs_hosp():
 
     print_section("Q4: ICU stays vs hospital admissions")
 
-    adm_path = os.path.join(HOSP_PROC_DIR, "patients_admissions_clean.parquet")
-    icu_path = os.path.join(ICU_PROC_DIR, "icustays_clean.parquet")
-
-    adm = pd.read_parquet(adm_path, columns=["subject_id", "hadm_id"])
-    icu = pd.read_parquet(icu_path, columns=["subject_id", "hadm_id", "stay_id"])
-
-    n_hadm_total   = adm["hadm_id"].nunique()
-    n_stay_total   = icu["stay_id"].nunique()
-    hadm_with_icu  = icu["hadm_id"].unique()
-    hadm_without_icu = np.setdiff1d(adm["hadm_id"].unique(), hadm_with_icu)
+    hadm_all       = load_unique_ids(ADM_PATH, "hadm_id")
+    n_hadm_total   = hadm_all.shape[0]
+    n_stay_total   = load_unique_ids(ICU_PATH, "stay_id").shape[0]
+    hadm_with_icu  = load_unique_ids(ICU_PATH, "hadm_id")
+    hadm_without_icu = diff_ids(hadm_all, hadm_with_icu)
 
     print(f"Total unique hadm_id (hospital admissions): {n_hadm_total}")
     print(f"Total unique stay_id (ICU stays)          : {n_stay_total}")
@@ -231,31 +312,34 @@ def q5_measurements():
 
     print_section("Q5: Measurements per ICU stay and value vs valuenum vs valueuom")
 
-    icu_path  = os.path.join(ICU_PROC_DIR, "icustays_clean.parquet")
     meas_path = os.path.join(ICU_PROC_DIR, "measurements_clean.parquet")
 
-    icu = pd.read_parquet(icu_path, columns=["subject_id", "hadm_id", "stay_id"])
-    meas = pd.read_parquet(
-        meas_path,
-        columns=[
-            "subject_id",
-            "hadm_id",
-            "stay_id",
-            "measurements_label",
-            "measurements_category",
-            "measurements_value",
-            "measurements_valuenum",
-            "measurements_valueuom",
-        ],
+    # Stream the 433M-row table like Q3 instead of materializing it: only
+    # the three aggregation columns are scanned, and per-batch uniques are
+    # unioned incrementally so peak memory stays at one batch
+    meta_cols = ["measurements_label", "measurements_category"]
+    scanner = ds.dataset(meas_path).scanner(
+        columns=["stay_id"] + meta_cols, batch_size=1 << 20
     )
 
-    n_stay_total  = icu["stay_id"].nunique()
-    n_meas_rows   = len(meas)
+    n_meas_rows = 0
+    stay_seen: set = set()
+    meta_seen = {col: {} for col in meta_cols}
 
-    stays_with_meas = meas["stay_id"].unique()
-    stays_all       = icu["stay_id"].unique()
+    for batch in scanner.to_batches():
+        n_meas_rows += batch.num_rows
+        stay_seen.update(pc.unique(batch.column("stay_id")).to_pylist())
+        for col in meta_cols:
+            for v in pc.unique(batch.column(col)).to_pylist():
+                if v is not None:
+                    meta_seen[col].setdefault(v)
 
-    stays_without_meas = np.setdiff1d(stays_all, stays_with_meas)
+    stays_all     = load_unique_ids(ICU_PATH, "stay_id")
+    n_stay_total  = stays_all.shape[0]
+
+    stays_with_meas = np.fromiter(stay_seen, dtype=np.int32, count=len(stay_seen))
+
+    stays_without_meas = diff_ids(stays_all, stays_with_meas)
     n_with_meas    = stays_with_meas.shape[0]
     n_without_meas = stays_without_meas.shape[0]
 
@@ -270,22 +354,28 @@ def q5_measurements():
 
     # Unique labels/categories
     print("\nUnique measurement meta:")
-    print(f"- measurements_label    : {meas['measurements_label'].nunique()}")
-    print(f"- measurements_category : {meas['measurements_category'].nunique()}")
+    print(f"- measurements_label    : {len(meta_seen['measurements_label'])}")
+    print(f"- measurements_category : {len(meta_seen['measurements_category'])}")
 
     print("\nExample measurements_label (5):")
-    print(meas["measurements_label"].dropna().drop_duplicates().head(5).tolist())
+    print(list(meta_seen["measurements_label"])[:5])
 
     print("\nExample measurements_category (5):")
-    print(meas["measurements_category"].dropna().drop_duplicates().head(5).tolist())
+    print(list(meta_seen["measurements_category"])[:5])
 
-    # Illustrate difference between value / valuenum / valueuom
+    # Illustrate difference between value / valuenum / valueuom.
+    # The free-text value columns are only needed for this 10-row sample,
+    # so decode just the first row group instead of all 433M rows.
     print("\nSample rows showing value vs valuenum vs valueuom:")
+    first_rg = pq.ParquetFile(meas_path).read_row_group(
+        0,
+        columns=["measurements_label",
+                 "measurements_value",
+                 "measurements_valuenum",
+                 "measurements_valueuom"],
+    )
     sample = (
-        meas[["measurements_label",
-              "measurements_value",
-              "measurements_valuenum",
-              "measurements_valueuom"]]
+        first_rg.to_pandas()
         .dropna(subset=["measurements_value"])
         .sample(n=10, random_state=0)
     )
@@ -309,53 +399,13 @@ def q6_medications():
        - Does every ICU stay have ≥1 medication row?
        - Unique medications_label, medications_category (and 5 examples)
     """
-
-    print_section("Q6: Medications per ICU stay and medication meta")
-
-    icu_path  = os.path.join(ICU_PROC_DIR, "icustays_clean.parquet")
-    meds_path = os.path.join(ICU_PROC_DIR, "medications_clean.parquet")
-
-    icu  = pd.read_parquet(icu_path,  columns=["subject_id", "hadm_id", "stay_id"])
-    meds = pd.read_parquet(
-        meds_path,
-        columns=[
-            "subject_id",
-            "hadm_id",
-            "stay_id",
-            "medications_label",
-            "medications_category",
-        ],
+    coverage_report(
+        "Q6: Medications per ICU stay and medication meta",
+        ICU_PATH, "stay_id", "ICU stays", "ICU stay",
+        os.path.join(ICU_PROC_DIR, "medications_clean.parquet"), "medication",
+        meta_cols=["medications_label", "medications_category"],
     )
 
-    n_stay_total = icu["stay_id"].nunique()
-    n_meds_rows  = len(meds)
-
-    stays_with_meds = meds["stay_id"].unique()
-    stays_all       = icu["stay_id"].unique()
-
-    stays_without_meds = np.setdiff1d(stays_all, stays_with_meds)
-    n_with_meds    = stays_with_meds.shape[0]
-    n_without_meds = stays_without_meds.shape[0]
-
-    print(f"Total unique stay_id (ICU stays)          : {n_stay_total}")
-    print(f"Total medications rows                     : {n_meds_rows}")
-    print(f"Average medication rows per ICU stay       : {n_meds_rows / n_stay_total:0.2f}")
-    print()
-    print(f"ICU stays with ≥1 medication row           : {n_with_meds} "
-          f"({100.0 * n_with_meds / n_stay_total:0.2f}%)")
-    print(f"ICU stays with 0 medication rows           : {n_without_meds} "
-          f"({100.0 * n_without_meds / n_stay_total:0.2f}%)")
-
-    print("\nUnique medication meta:")
-    print(f"- medications_label    : {meds['medications_label'].nunique()}")
-    print(f"- medications_category : {meds['medications_category'].nunique()}")
-
-    print("\nExample medications_label (5):")
-    print(meds["medications_label"].dropna().drop_duplicates().head(5).tolist())
-
-    print("\nExample medications_category (5):")
-    print(meds["medications_category"].dropna().drop_duplicates().head(5).tolist())
-
 
 # ---------------------------------------------------------------------
 # Q7 – Outputevents per ICU stay + label / category
@@ -366,53 +416,13 @@ def q7_outputevents():
        - Does every ICU stay have ≥1 outputevent row?
        - Unique outputevents_label, outputevents_category (and 5 examples)
     """
-
-    print_section("Q7: Outputevents per ICU stay and output meta")
-
-    icu_path   = os.path.join(ICU_PROC_DIR, "icustays_clean.parquet")
-    out_path   = os.path.join(ICU_PROC_DIR, "outputevents_clean.parquet")
-
-    icu  = pd.read_parquet(icu_path, columns=["subject_id", "hadm_id", "stay_id"])
-    out  = pd.read_parquet(
-        out_path,
-        columns=[
-            "subject_id",
-            "hadm_id",
-            "stay_id",
-            "outputevents_label",
-            "outputevents_category",
-        ],
+    coverage_report(
+        "Q7: Outputevents per ICU stay and output meta",
+        ICU_PATH, "stay_id", "ICU stays", "ICU stay",
+        os.path.join(ICU_PROC_DIR, "outputevents_clean.parquet"), "outputevent",
+        meta_cols=["outputevents_label", "outputevents_category"],
     )
 
-    n_stay_total   = icu["stay_id"].nunique()
-    n_out_rows     = len(out)
-
-    stays_with_out = out["stay_id"].unique()
-    stays_all      = icu["stay_id"].unique()
-
-    stays_without_out = np.setdiff1d(stays_all, stays_with_out)
-    n_with_out    = stays_with_out.shape[0]
-    n_without_out = stays_without_out.shape[0]
-
-    print(f"Total unique stay_id (ICU stays)          : {n_stay_total}")
-    print(f"Total outputevents rows                    : {n_out_rows}")
-    print(f"Average outputevents per ICU stay          : {n_out_rows / n_stay_total:0.2f}")
-    print()
-    print(f"ICU stays with ≥1 outputevent              : {n_with_out} "
-          f"({100.0 * n_with_out / n_stay_total:0.2f}%)")
-    print(f"ICU stays with 0 outputevents              : {n_without_out} "
-          f"({100.0 * n_without_out / n_stay_total:0.2f}%)")
-
-    print("\nUnique outputevents meta:")
-    print(f"- outputevents_label    : {out['outputevents_label'].nunique()}")
-    print(f"- outputevents_category : {out['outputevents_category'].nunique()}")
-
-    print("\nExample outputevents_label (5):")
-    print(out["outputevents_label"].dropna().drop_duplicates().head(5).tolist())
-
-    print("\nExample outputevents_category (5):")
-    print(out["outputevents_category"].dropna().drop_duplicates().head(5).tolist())
-
 
 # ---------------------------------------------------------------------
 # Q8 – ICU procedureevents per ICU stay + label / category
@@ -423,53 +433,13 @@ def q8_procedureevents():
        - Does every ICU stay have ≥1 procedureevent?
        - Unique procedureevents_label, procedureevents_category (and 5 examples)
     """
-
-    print_section("Q8: ICU procedureevents per ICU stay and procedureevent meta")
-
-    icu_path  = os.path.join(ICU_PROC_DIR, "icustays_clean.parquet")
-    pe_path   = os.path.join(ICU_PROC_DIR, "procedureevents_clean.parquet")
-
-    icu = pd.read_parquet(icu_path, columns=["subject_id", "hadm_id", "stay_id"])
-    pe  = pd.read_parquet(
-        pe_path,
-        columns=[
-            "subject_id",
-            "hadm_id",
-            "stay_id",
-            "procedureevents_label",
-            "procedureevents_category",
-        ],
+    coverage_report(
+        "Q8: ICU procedureevents per ICU stay and procedureevent meta",
+        ICU_PATH, "stay_id", "ICU stays", "ICU stay",
+        os.path.join(ICU_PROC_DIR, "procedureevents_clean.parquet"), "ICU procedureevent",
+        meta_cols=["procedureevents_label", "procedureevents_category"],
     )
 
-    n_stay_total = icu["stay_id"].nunique()
-    n_pe_rows    = len(pe)
-
-    stays_with_pe = pe["stay_id"].unique()
-    stays_all     = icu["stay_id"].unique()
-
-    stays_without_pe = np.setdiff1d(stays_all, stays_with_pe)
-    n_with_pe    = stays_with_pe.shape[0]
-    n_without_pe = stays_without_pe.shape[0]
-
-    print(f"Total unique stay_id (ICU stays)          : {n_stay_total}")
-    print(f"Total ICU procedureevents rows             : {n_pe_rows}")
-    print(f"Average ICU procedureevents per ICU stay   : {n_pe_rows / n_stay_total:0.2f}")
-    print()
-    print(f"ICU stays with ≥1 ICU procedureevent       : {n_with_pe} "
-          f"({100.0 * n_with_pe / n_stay_total:0.2f}%)")
-    print(f"ICU stays with 0 ICU procedureevents       : {n_without_pe} "
-          f"({100.0 * n_without_pe / n_stay_total:0.2f}%)")
-
-    print("\nUnique ICU procedureevents meta:")
-    print(f"- procedureevents_label    : {pe['procedureevents_label'].nunique()}")
-    print(f"- procedureevents_category : {pe['procedureevents_category'].nunique()}")
-
-    print("\nExample procedureevents_label (5):")
-    print(pe["procedureevents_label"].dropna().drop_duplicates().head(5).tolist())
-
-    print("\nExample procedureevents_category (5):")
-    print(pe["procedureevents_category"].dropna().drop_duplicates().head(5).tolist())
-
 
 # ---------------------------------------------------------------------
 # Q9 – Relationship between HOSP procedures and ICU procedureevents
@@ -491,20 +461,16 @@ def q9_compare_procedures():
     hosp_proc_path = os.path.join(HOSP_PROC_DIR, "procedures_clean.parquet")
     icu_pe_path    = os.path.join(ICU_PROC_DIR, "procedureevents_clean.parquet")
 
-    # Only load columns we need
-    hosp_proc = pd.read_parquet(
-        hosp_proc_path,
-        columns=["subject_id", "hadm_id", "proc_long_title"],
-    )
-    icu_pe = pd.read_parquet(
-        icu_pe_path,
-        columns=["subject_id", "hadm_id", "stay_id", "procedureevents_label"],
-    )
+    # Only load columns we need, and stay in Arrow for the overlap: the
+    # intersection is a native is_in hash probe over the deduplicated id
+    # arrays instead of two boxed Python int sets
+    hosp_tbl = pq.read_table(hosp_proc_path, columns=["hadm_id", "proc_long_title"])
+    icu_tbl  = pq.read_table(icu_pe_path, columns=["hadm_id", "procedureevents_label"])
 
-    hadm_hosp = set(hosp_proc["hadm_id"].unique())
-    hadm_icu  = set(icu_pe["hadm_id"].unique())
+    hadm_hosp = pc.unique(hosp_tbl["hadm_id"])
+    hadm_icu  = pc.unique(icu_tbl["hadm_id"])
 
-    hadm_both = hadm_hosp & hadm_icu
+    hadm_both = hadm_hosp.filter(pc.is_in(hadm_hosp, value_set=hadm_icu))
 
     print(f"Unique hadm_id in HOSP procedures         : {len(hadm_hosp)}")
     print(f"Unique hadm_id in ICU procedureevents     : {len(hadm_icu)}")
@@ -515,14 +481,30 @@ def q9_compare_procedures():
         return
 
     # Show a few example admissions
-    example_hadm = list(hadm_both)[:5]
+    example_hadm = hadm_both.slice(0, 5).to_pylist()
     print("\nExample hadm_id present in both tables:", example_hadm)
 
+    # Only the example admissions' rows ever reach pandas; the sorted
+    # hadm_id indexes make each example an O(log N) .loc lookup
+    example_arr = pa.array(example_hadm, type=hosp_tbl["hadm_id"].type)
+    hosp_idx = (
+        hosp_tbl.filter(pc.is_in(hosp_tbl["hadm_id"], value_set=example_arr))
+        .to_pandas()
+        .set_index("hadm_id", drop=False)
+        .sort_index()
+    )
+    icu_idx = (
+        icu_tbl.filter(pc.is_in(icu_tbl["hadm_id"], value_set=example_arr))
+        .to_pandas()
+        .set_index("hadm_id", drop=False)
+        .sort_index()
+    )
+
     for h in example_hadm:
         print("\n--- hadm_id:", h, "---")
 
-        hosp_rows = hosp_proc[hosp_proc["hadm_id"] == h]
-        icu_rows  = icu_pe[icu_pe["hadm_id"] == h]
+        hosp_rows = hosp_idx.loc[[h]]
+        icu_rows  = icu_idx.loc[[h]]
 
         print("HOSP procedures (proc_long_title):")
         print(
@@ -567,16 +549,21 @@ def q10_discharge_notes():
 
     print_section("Q10: Discharge notes coverage (including 1 vs >1 split)")
 
-    adm_path   = os.path.join(HOSP_PROC_DIR,  "patients_admissions_clean.parquet")
     notes_path = os.path.join(NOTES_PROC_DIR, "discharge_clean.parquet")
 
-    adm   = pd.read_parquet(adm_path,   columns=["subject_id", "hadm_id"])
-    notes = pd.read_parquet(notes_path, columns=["subject_id", "hadm_id", "note_id"])
+    notes = pq.read_table(notes_path, columns=["hadm_id", "note_id"])
+
+    # One native hash aggregate yields both the per-hadm distinct-note
+    # counts and the set of hadm_id with notes; pandas never sees the
+    # full notes table, only the small per-hadm result below
+    agg = notes.group_by("hadm_id").aggregate([("note_id", "count_distinct")])
+    hadm_with_notes = agg.column("hadm_id").to_numpy().astype(np.int32, copy=False)
+    note_counts     = agg.column("note_id_count_distinct").to_numpy()
 
     # Basic coverage
-    n_hadm_total    = adm["hadm_id"].nunique()
-    hadm_with_notes = notes["hadm_id"].unique()
-    n_hadm_with_notes = len(hadm_with_notes)
+    hadm_all        = load_unique_ids(ADM_PATH, "hadm_id")
+    n_hadm_total    = hadm_all.shape[0]
+    n_hadm_with_notes = hadm_with_notes.shape[0]
 
     coverage = n_hadm_with_notes / n_hadm_total
 
@@ -584,30 +571,26 @@ def q10_discharge_notes():
     print(f"Admissions with ≥1 discharge note          : {n_hadm_with_notes}")
     print(f"Coverage                                   : {coverage*100:0.2f}%")
 
-    hadm_without_notes = np.setdiff1d(adm["hadm_id"].unique(), hadm_with_notes)
+    hadm_without_notes = diff_ids(hadm_all, hadm_with_notes)
     print(f"Admissions with 0 discharge notes          : {len(hadm_without_notes)} "
           f"({100.0 * len(hadm_without_notes) / n_hadm_total:0.2f}%)")
 
     # --- New part: split by number of discharge notes per hadm_id ---
-    # Count how many distinct notes each hadm_id has
-    notes_per_hadm = (
-        notes.groupby("hadm_id")["note_id"]
-        .nunique()
-        .rename("n_discharge_notes")
-    )
-
-    n_exactly_1 = (notes_per_hadm == 1).sum()
-    n_more_than_1 = (notes_per_hadm > 1).sum()
+    n_exactly_1 = int(np.sum(note_counts == 1))
+    n_more_than_1 = int(np.sum(note_counts > 1))
 
     print("\nBreakdown among admissions WITH ≥1 discharge note:")
     print(f"- Admissions with exactly 1 discharge note : {n_exactly_1} "
           f"({100.0 * n_exactly_1 / n_hadm_with_notes:0.2f}% of those with notes)")
     print(f"- Admissions with >1 discharge note        : {n_more_than_1} "
           f"({100.0 * n_more_than_1 / n_hadm_with_notes:0.2f}% of those with notes)")
-    print(f"- Max number of discharge notes for any admission: {notes_per_hadm.max()}")
+    print(f"- Max number of discharge notes for any admission: {note_counts.max()}")
 
     if n_more_than_1 > 0:
         # Show a few example hadm_id with multiple discharge notes
+        notes_per_hadm = pd.Series(
+            note_counts, index=hadm_with_notes, name="n_discharge_notes"
+        )
         multi = notes_per_hadm[notes_per_hadm > 1].sort_values(ascending=False)
         example_multi = multi.head(5)
         print("\nExample hadm_id with multiple discharge notes:")
@@ -615,7 +598,9 @@ def q10_discharge_notes():
 
         # Optionally, show the note_ids for one example hadm_id
         example_hadm = example_multi.index[0]
-        example_notes = notes[notes["hadm_id"] == example_hadm][["hadm_id", "note_id"]]
+        example_notes = notes.filter(
+            pc.equal(notes["hadm_id"], example_hadm)
+        ).to_pandas()
         print(f"\nnote_id values for example hadm_id={example_hadm}:")
         print(example_notes.drop_duplicates().to_string(index=False))
 
@@ -637,18 +622,45 @@ def q10_discharge_notes():
 # ---------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------
+def _run_report(fn_name):
+    """Run one qN report in a worker process and return its output.
+
+    stdout is captured per worker so concurrent reports never interleave;
+    pa.set_cpu_count keeps Arrow's internal thread pool from
+    oversubscribing the node when several workers decode parquet at once.
+    """
+    pa.set_cpu_count(2)
+    buf = io.StringIO()
+    with redirect_stdout(buf):
+        globals()[fn_name]()
+    return buf.getvalue()
+
+
+# Reports that only touch the smaller tables; they share no in-Python
+# state (each worker re-reads its own inputs), so parquet decoding
+# overlaps across files
+PARALLEL_REPORTS = [
+    "q1_diagnoses",
+    "q2_hosp_procedures",
+    "q4_icu_vs_hosp",
+    "q6_medications",
+    "q7_outputevents",
+    "q8_procedureevents",
+    "q9_compare_procedures",
+    "q10_discharge_notes",
+]
+
+
 def main():
     # You can comment out any heavy sections while experimenting.
-    q1_diagnoses()
-    q2_hosp_procedures()
+    # ex.map yields in submission order, so the report still reads
+    # q1 → q10 apart from the RAM-hungry streaming questions (Q3, Q5),
+    # which run serially at the end to stay inside the node's memory.
+    with ProcessPoolExecutor(max_workers=4) as ex:
+        for text in ex.map(_run_report, PARALLEL_REPORTS):
+            sys.stdout.write(text)
     q3_lab_tests()
-    q4_icu_vs_hosp()
     q5_measurements()
-    q6_medications()
-    q7_outputevents()
-    q8_procedureevents()
-    q9_compare_procedures()
-    q10_discharge_notes()
 
 
 if __name__ == "__main__":
@@ -1,8 +1,10 @@
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import pandas as pd
+import pyarrow as pa
 
 # -------------------------------------------------------------------
 # Ensure project root (/home/soham_shah/mimic_llm) is on sys.path
@@ -35,41 +37,83 @@ def safe_str(val: Any) -> str:
         return repr(val)
 
 
-def write_table_block(f, key: str, value: Any):
+def write_table_block(emit, key: str, value: Any):
     """
-    Print one table or object for a stay into the file, showing
-    ALL columns and ALL rows, with clear formatting.
+    Emit one table or object for a stay, showing ALL columns and ALL
+    rows, with clear formatting. `emit` is a list.append-style callable;
+    the caller joins and writes the accumulated pieces in one go.
     """
-    f.write(TABLE_SEP + "\n")
-    f.write(f"TABLE: {key}\n")
+    emit(TABLE_SEP + "\n")
+    emit(f"TABLE: {key}\n")
 
     if isinstance(value, pd.DataFrame):
+        # Drop columns that are entirely null for this stay before any
+        # row formatting; they are listed by name so the dump stays
+        # complete without paying to print thousands of NaN cells
+        keep = value.notna().any()
+        empty_cols = [str(c) for c in value.columns[~keep]]
+        if empty_cols:
+            value = value.loc[:, keep]
+
         n_rows, n_cols = value.shape
-        f.write(f"(DataFrame with {n_rows} rows x {n_cols} columns)\n\n")
+        emit(f"(DataFrame with {n_rows} rows x {n_cols} columns)\n\n")
 
         # Show all columns explicitly
         cols = [str(c) for c in value.columns]
-        f.write("COLUMNS:\n")
-        f.write("  " + ", ".join(cols) + "\n\n")
+        emit("COLUMNS:\n")
+        emit("  " + ", ".join(cols) + "\n\n")
+        if empty_cols:
+            emit("EMPTY COLUMNS (all-null, omitted from rows):\n")
+            emit("  " + ", ".join(empty_cols) + "\n\n")
 
         if n_rows == 0:
-            f.write("[NO ROWS]\n")
+            emit("[NO ROWS]\n")
         else:
-            # Convert to list-of-dicts and print each row clearly
-            records = value.to_dict(orient="records")
-            for i, row in enumerate(records):
-                f.write(f"ROW {i}:\n")
-                for col in cols:
-                    v = row.get(col)
-                    f.write(f"  {col}: {safe_str(v)}\n")
-                f.write("\n")
+            # Unbox cells through Arrow: from_pandas + per-column
+            # to_pylist runs in C++ and is much cheaper than pandas'
+            # per-cell object conversion. Columns Arrow can't type
+            # (mixed objects) fall back to vectorized astype(str).
+            try:
+                tbl = pa.Table.from_pandas(value, preserve_index=False)
+                col_values = [tbl.column(c).to_pylist() for c in tbl.column_names]
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                col_values = [value[c].astype(str).to_numpy() for c in value.columns]
+            for i in range(n_rows):
+                emit(
+                    f"ROW {i}:\n"
+                    + "".join(f"  {col}: {vals[i]}\n" for col, vals in zip(cols, col_values))
+                    + "\n"
+                )
     else:
-        f.write(f"(Non-DataFrame object of type {type(value).__name__})\n\n")
+        emit(f"(Non-DataFrame object of type {type(value).__name__})\n\n")
         # For non-DataFrame objects (dicts, strings, etc.), just dump repr
-        f.write(safe_str(value))
-        f.write("\n")
+        emit(safe_str(value))
+        emit("\n")
+
+    emit(TABLE_SEP + "\n\n")
+
+
+def render_stay(stay_id: int) -> str:
+    """Load and format one stay's full text block."""
+    stay_id = int(stay_id)
+    print(f"  - Processing stay_id={stay_id} ...")
+    stay_data = load_all_tables_for_stay(stay_id)
+
+    # Accumulate the whole stay in memory and flush it with one
+    # write: one big encode instead of thousands of tiny ones
+    parts: list = []
+
+    # Big header for this stay
+    parts.append(STAY_SEP + "\n")
+    parts.append(f"STAY_ID = {stay_id}\n")
+    parts.append(STAY_SEP + "\n\n")
 
-    f.write(TABLE_SEP + "\n\n")
+    # One clearly separated block per table / key
+    for key, value in stay_data.items():
+        write_table_block(parts.append, key, value)
+
+    parts.append("\n\n")
+    return "".join(parts)
 
 
 def main():
@@ -81,22 +125,14 @@ def main():
     print(f"Exporting human-readable data for {len(STAY_IDS)} stays...")
     print(f"Output file: {out_path}")
 
-    with open(out_path, "w", encoding="utf-8") as f:
-        for stay_id in STAY_IDS:
-            stay_id = int(stay_id)
-            print(f"  - Processing stay_id={stay_id} ...")
-            stay_data = load_all_tables_for_stay(stay_id)
-
-            # Big header for this stay
-            f.write(STAY_SEP + "\n")
-            f.write(f"STAY_ID = {stay_id}\n")
-            f.write(STAY_SEP + "\n\n")
+    # Render stays concurrently — the parquet reads inside
+    # load_all_tables_for_stay release the GIL, so wall time tracks the
+    # slowest stay. ex.map preserves STAY_IDS order for the final write.
+    with ThreadPoolExecutor(max_workers=len(STAY_IDS)) as ex:
+        chunks = list(ex.map(render_stay, STAY_IDS))
 
-            # One clearly separated block per table / key
-            for key, value in stay_data.items():
-                write_table_block(f, key, value)
-
-            f.write("\n\n")
+    with open(out_path, "w", encoding="utf-8") as f:
+        f.write("".join(chunks))
 
     print("Done.")
     print("You can now download or share:", out_path)
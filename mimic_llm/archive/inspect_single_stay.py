@@ -2,6 +2,9 @@ import os
 import sys
 import argparse
 import pandas as pd
+import pyarrow.compute as pc
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 
 # --- wiring for imports from project root ---
 
@@ -19,10 +22,45 @@ from paths import (
 )
 
 
+# Feather/IPC mirror of the cohort parquet files. The cohort is tiny
+# (250 stays) and re-read on every debug run, so the first load converts
+# each table to uncompressed Feather; later runs mmap it back with
+# zero-copy IPC instead of paying parquet decompress + decode.
+CACHE_DIR = "/tmp/mimic_cohort_cache"
+
+
+def read_table_cached(path, columns=None):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    cache = os.path.join(CACHE_DIR, os.path.basename(path) + ".feather")
+    if os.path.exists(cache) and os.stat(cache).st_mtime >= os.stat(path).st_mtime:
+        return feather.read_table(cache, columns=columns, memory_map=True)
+    table = pq.read_table(path)
+    feather.write_feather(table, cache, compression="uncompressed")
+    return table.select(columns) if columns is not None else table
+
+
+def count_matching(path, key, value):
+    """Matching-row count from just the key column — no row materialization."""
+    col = read_table_cached(path, columns=[key])[key]
+    n = pc.sum(pc.equal(col, value)).as_py()
+    return int(n) if n is not None else 0
+
+
+def load_filtered(path, key, value):
+    """One stay's rows from a cohort table, filtered before pandas.
+
+    The equality mask runs on the (mmap'd) Arrow table, so pandas only
+    ever materializes the handful of matching rows instead of the whole
+    cohort file.
+    """
+    table = read_table_cached(path)
+    rows = table.filter(pc.equal(table[key], value))
+    return rows.to_pandas(split_blocks=True, self_destruct=True)
+
+
 def load_cohort():
     path = os.path.join(COHORT_META_DIR, "cohort_icu_250.parquet")
-    cohort = pd.read_parquet(path)
-    return cohort
+    return read_table_cached(path).to_pandas()
 
 
 def pretty_header(title: str):
@@ -70,27 +108,26 @@ def main():
     # 2. Load ICU tables (already filtered to cohort) and slice by stay_id
     pretty_header("ICU TABLES")
 
-    def load_icu_table(filename):
+    def count_icu_rows(filename):
         path = os.path.join(ICU_PROC_COHORT_DIR, filename)
-        return pd.read_parquet(path)
+        return count_matching(path, "stay_id", stay_id)
 
-    icu_cohort = load_icu_table("icustays_clean_icu_250.parquet")
-    meas_cohort = load_icu_table("measurements_clean_icu_250.parquet")
-    meds_cohort = load_icu_table("medications_clean_icu_250.parquet")
-    out_cohort = load_icu_table("outputevents_clean_icu_250.parquet")
-    proc_icu_cohort = load_icu_table("procedureevents_clean_icu_250.parquet")
-
-    icu_this = icu_cohort[icu_cohort["stay_id"] == stay_id]
-    meas_this = meas_cohort[meas_cohort["stay_id"] == stay_id]
-    meds_this = meds_cohort[meds_cohort["stay_id"] == stay_id]
-    out_this = out_cohort[out_cohort["stay_id"] == stay_id]
-    proc_icu_this = proc_icu_cohort[proc_icu_cohort["stay_id"] == stay_id]
+    # Only icustays is displayed; the event tables are just counted, so
+    # nothing beyond their stay_id column is ever read
+    icu_this = load_filtered(
+        os.path.join(ICU_PROC_COHORT_DIR, "icustays_clean_icu_250.parquet"),
+        "stay_id", stay_id,
+    )
+    n_meas = count_icu_rows("measurements_clean_icu_250.parquet")
+    n_meds = count_icu_rows("medications_clean_icu_250.parquet")
+    n_out = count_icu_rows("outputevents_clean_icu_250.parquet")
+    n_proc_icu = count_icu_rows("procedureevents_clean_icu_250.parquet")
 
     print(f"icustays rows           : {len(icu_this)}")
-    print(f"measurements rows       : {len(meas_this)}")
-    print(f"medications rows        : {len(meds_this)}")
-    print(f"outputevents rows       : {len(out_this)}")
-    print(f"procedureevents (ICU)   : {len(proc_icu_this)}")
+    print(f"measurements rows       : {n_meas}")
+    print(f"medications rows        : {n_meds}")
+    print(f"outputevents rows       : {n_out}")
+    print(f"procedureevents (ICU)   : {n_proc_icu}")
 
     print("\nicustays_clean (this stay):")
     print(icu_this.head())
@@ -98,33 +135,24 @@ def main():
     # 3. Load HOSP tables (cohort-filtered) and slice by hadm_id (and stay_id if present)
     pretty_header("HOSPITAL TABLES")
 
-    def load_hosp_table(filename):
+    def hosp_key(filename, prefer_stay=False):
         path = os.path.join(HOSP_PROC_COHORT_DIR, filename)
-        return pd.read_parquet(path)
-
-    patadm_cohort = load_hosp_table("patients_admissions_clean_icu_250.parquet")
-    dx_cohort = load_hosp_table("diagnoses_clean_icu_250.parquet")
-    procs_cohort = load_hosp_table("procedures_clean_icu_250.parquet")
-    labs_cohort = load_hosp_table("lab_tests_clean_icu_250.parquet")
-
-    patadm_this = patadm_cohort[patadm_cohort["hadm_id"] == hadm_id]
-    dx_this = dx_cohort[dx_cohort["hadm_id"] == hadm_id]
-
-    # procedures/labs ICU-window tables *should* now also have stay_id after our filter step
-    if "stay_id" in procs_cohort.columns:
-        procs_this = procs_cohort[procs_cohort["stay_id"] == stay_id]
-    else:
-        procs_this = procs_cohort[procs_cohort["hadm_id"] == hadm_id]
-
-    if "stay_id" in labs_cohort.columns:
-        labs_this = labs_cohort[labs_cohort["stay_id"] == stay_id]
-    else:
-        labs_this = labs_cohort[labs_cohort["hadm_id"] == hadm_id]
+        # procedures/labs ICU-window tables *should* now also have
+        # stay_id after our filter step; fall back to hadm_id otherwise
+        if prefer_stay and "stay_id" in pq.read_schema(path).names:
+            return path, "stay_id", stay_id
+        return path, "hadm_id", hadm_id
+
+    # Displayed tables are loaded; procedures/labs are count-only
+    patadm_this = load_filtered(*hosp_key("patients_admissions_clean_icu_250.parquet"))
+    dx_this = load_filtered(*hosp_key("diagnoses_clean_icu_250.parquet"))
+    n_procs = count_matching(*hosp_key("procedures_clean_icu_250.parquet", prefer_stay=True))
+    n_labs = count_matching(*hosp_key("lab_tests_clean_icu_250.parquet", prefer_stay=True))
 
     print(f"patients_admissions rows: {len(patadm_this)}")
     print(f"diagnoses rows          : {len(dx_this)}")
-    print(f"procedures (ICU-window) : {len(procs_this)}")
-    print(f"lab tests (ICU-window)  : {len(labs_this)}")
+    print(f"procedures (ICU-window) : {n_procs}")
+    print(f"lab tests (ICU-window)  : {n_labs}")
 
     print("\npatients_admissions (this hadm_id):")
     print(patadm_this.head())
@@ -136,9 +164,7 @@ def main():
     pretty_header("DISCHARGE NOTE (TARGET TEXT)")
 
     discharge_path = os.path.join(NOTES_PROC_COHORT_DIR, "discharge_clean_icu_250.parquet")
-    discharge_cohort = pd.read_parquet(discharge_path)
-
-    disc_this = discharge_cohort[discharge_cohort["hadm_id"] == hadm_id]
+    disc_this = load_filtered(discharge_path, "hadm_id", hadm_id)
 
     print(f"discharge rows          : {len(disc_this)}")
     if len(disc_this) == 1:
@@ -156,14 +182,14 @@ def main():
     print(f"hadm_id                 : {hadm_id}")
     print(f"stay_id                 : {stay_id}")
     print(f"icustays rows           : {len(icu_this)}")
-    print(f"measurements rows       : {len(meas_this)}")
-    print(f"medications rows        : {len(meds_this)}")
-    print(f"outputevents rows       : {len(out_this)}")
-    print(f"procedureevents (ICU)   : {len(proc_icu_this)}")
+    print(f"measurements rows       : {n_meas}")
+    print(f"medications rows        : {n_meds}")
+    print(f"outputevents rows       : {n_out}")
+    print(f"procedureevents (ICU)   : {n_proc_icu}")
     print(f"patients_admissions rows: {len(patadm_this)}")
     print(f"diagnoses rows          : {len(dx_this)}")
-    print(f"procedures (ICU-window) : {len(procs_this)}")
-    print(f"lab tests (ICU-window)  : {len(labs_this)}")
+    print(f"procedures (ICU-window) : {n_procs}")
+    print(f"lab tests (ICU-window)  : {n_labs}")
     print(f"discharge notes rows    : {len(disc_this)}")
 
 
@@ -1,9 +1,13 @@
+import functools
 import os
+import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 
 import pandas as pd
 import numpy as np
+import pyarrow.parquet as pq
 
 # --- wiring to import paths.py from project root ---
 
@@ -24,12 +28,217 @@ from paths import (  # type: ignore
 # -------------------------------------------------------------------
 
 
+# Role patterns for _find_col. The lookahead forms are anchored with \A
+# so each containment test is evaluated against the whole column name.
+_TIME_PAT = r"charttime|datetime|_time$|_date$"
+_START_PAT = r"\A(?=.*start)(?=.*(?:date|time))"
+_END_PAT = r"\A(?=.*end)(?=.*(?:date|time))"
+
+
+@functools.lru_cache(maxsize=None)
+def _col_regex(pattern: str) -> "re.Pattern":
+    return re.compile(pattern)
+
+
+@functools.lru_cache(maxsize=None)
+def _find_col(
+    columns: tuple, exact: Optional[str] = None, pattern: Optional[str] = None
+) -> Optional[str]:
+    """
+    Resolve a role column ("the label column", "the time column", ...)
+    against a fixed schema.
+
+    The cohort schemas never change within a process, so this is cached
+    on the column tuple: each view's rediscovery loop over df.columns
+    runs once per schema instead of once per stay. `exact` wins when
+    present; otherwise the first column matching `pattern` is used.
+    """
+    if exact is not None and exact in columns:
+        return exact
+    if pattern is not None:
+        search = _col_regex(pattern).search
+        for c in columns:
+            if search(c):
+                return c
+    return None
+
+
+@functools.lru_cache(maxsize=32)
+def _read_parquet_cached(path: str, mtime: float) -> pd.DataFrame:
+    """
+    Read a parquet file once per (path, mtime) and keep the DataFrame.
+
+    The cohort tables are identical across stay_ids, so a batch of N
+    stays should decode each file once, not N times. `mtime` is part of
+    the cache key purely to invalidate the entry if a file is rebuilt.
+
+    Decoding goes through pyarrow directly: read_table plus a
+    split_blocks/self_destruct to_pandas skips the consolidated-block
+    memcpy that pd.read_parquet pays on wide tables like measurements.
+    memory_map=True lets the decoder work straight off the page cache
+    instead of first copying the file bytes into a private buffer.
+    """
+    table = pq.read_table(path, memory_map=True)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _read_parquet(path: str) -> pd.DataFrame:
+    """Cached parquet load; see _read_parquet_cached."""
+    return _read_parquet_cached(path, os.path.getmtime(path))
+
+
+@functools.lru_cache(maxsize=32)
+def _indexed_parquet_cached(path: str, key: str, mtime: float) -> pd.DataFrame:
+    """
+    Cached (path, key) view of a table indexed by its slice key.
+
+    Sorting the index once turns every per-stay boolean mask
+    (`df[df["stay_id"] == x]`, a full scan per stay) into an O(log N)
+    `.loc` lookup, which is what the per-stay loader uses.
+    """
+    df = _read_parquet_cached(path, mtime)
+    return df.set_index(key, drop=False).sort_index()
+
+
+def _read_parquet_indexed(path: str, key: str) -> pd.DataFrame:
+    """Cached key-indexed parquet load; see _indexed_parquet_cached."""
+    return _indexed_parquet_cached(path, key, os.path.getmtime(path))
+
+
+@functools.lru_cache(maxsize=8)
+def _meds_table_cached(path: str, mtime: float) -> pd.DataFrame:
+    """
+    Medications table with start/end columns parsed to datetimes once.
+
+    When the parquet file stores these as strings, parsing them here
+    means build_view_meds never re-runs pd.to_datetime per stay; native
+    timestamp columns pass through untouched.
+    """
+    df = _indexed_parquet_cached(path, "stay_id", mtime)
+    cols = tuple(df.columns)
+    updates = {}
+    for col in (_find_col(cols, pattern=_START_PAT), _find_col(cols, pattern=_END_PAT)):
+        if col is not None and df[col].dtype == object:
+            updates[col] = pd.to_datetime(df[col], errors="coerce")
+    return df.assign(**updates) if updates else df
+
+
+def _read_meds_table(path: str) -> pd.DataFrame:
+    """Cached datetime-normalized medications load; see _meds_table_cached."""
+    return _meds_table_cached(path, os.path.getmtime(path))
+
+
+@functools.lru_cache(maxsize=4)
+def _discharge_text_by_hadm_cached(path: str, mtime: float) -> Dict[int, str]:
+    """
+    {hadm_id: discharge text} built once from the discharge table.
+
+    Cohort building enforces one note per hadm_id (the first row wins
+    defensively, as before), so a flat dict turns the per-stay lookup
+    into a hash get instead of an index lookup on a frame carrying a
+    large text column.
+    """
+    df = _read_parquet_cached(path, mtime)
+    if "text" not in df.columns:
+        return {}
+    df = df.drop_duplicates("hadm_id", keep="first")
+    return {int(h): str(t) for h, t in zip(df["hadm_id"], df["text"])}
+
+
+def _discharge_text_by_hadm(path: str) -> Dict[int, str]:
+    """Cached discharge-text map; see _discharge_text_by_hadm_cached."""
+    return _discharge_text_by_hadm_cached(path, os.path.getmtime(path))
+
+
+def _hosp_slice_key(path: str) -> str:
+    """ICU-window hosp tables carry stay_id; older ones only hadm_id."""
+    return "stay_id" if "stay_id" in pq.read_schema(path).names else "hadm_id"
+
+
+@functools.lru_cache(maxsize=256)
+def _read_rows_for_key_cached(
+    path: str, key: str, value: int, mtime: float
+) -> pd.DataFrame:
+    """
+    Read only the rows of a parquet file whose `key` equals `value`,
+    pruning via per-row-group min/max statistics.
+
+    The filter_*_to_cohort scripts write the large tables sorted by
+    stay_id with small row groups, so a single stay lives in one or two
+    row groups and everything else is skipped without being decoded.
+    Files without usable statistics fall back to the cached full read
+    plus a boolean filter.
+    """
+    pf = pq.ParquetFile(path)
+    md = pf.metadata
+    try:
+        col_idx = pf.schema_arrow.names.index(key)
+    except ValueError:
+        col_idx = -1
+
+    keep: Optional[List[int]] = []
+    if col_idx < 0:
+        keep = None
+    else:
+        for rg in range(md.num_row_groups):
+            stats = md.row_group(rg).column(col_idx).statistics
+            if stats is None or not stats.has_min_max:
+                keep = None
+                break
+            if stats.min <= value <= stats.max:
+                keep.append(rg)
+
+    if keep is None:
+        # No statistics to prune on — full (cached) scan
+        df = _read_parquet_cached(path, mtime)
+        return df[df[key] == value]
+
+    if not keep:
+        return pf.schema_arrow.empty_table().to_pandas()
+
+    table = pf.read_row_groups(keep)
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    return df[df[key] == value]
+
+
+def _read_rows_for_key(path: str, key: str, value: int) -> pd.DataFrame:
+    """Cached statistics-pruned read; see _read_rows_for_key_cached."""
+    return _read_rows_for_key_cached(path, key, int(value), os.path.getmtime(path))
+
+
+def _rows_for(df: pd.DataFrame, key_value: int) -> pd.DataFrame:
+    """All rows of a key-indexed table for one key, or an empty frame."""
+    if key_value in df.index:
+        return df.loc[[key_value]]
+    return df.iloc[0:0]
+
+
 def _first_non_null(series: pd.Series) -> Any:
     """Return the first non-null value in a Series, or None."""
     non_null = series.dropna()
     return non_null.iloc[0] if not non_null.empty else None
 
 
+def _dominant_per_label(
+    df: pd.DataFrame, label_col: str, value_col: str
+) -> pd.Series:
+    """
+    Most frequent non-null value of `value_col` for each label, as a
+    Series indexed by label (labels with only nulls are absent).
+
+    One vectorized size() over (label, value) pairs plus a level-0
+    idxmax replaces a per-group .mode() call, each of which allocates
+    and sorts its own Series. The sorted pair index keeps mode's
+    tie-break (smallest value among the most frequent).
+    """
+    sizes = df.groupby([label_col, value_col], observed=True).size()
+    sizes = sizes[sizes > 0]
+    if sizes.empty:
+        return pd.Series(dtype="object")
+    winners = sizes.groupby(level=0, observed=True).idxmax()
+    return winners.map(lambda pair: pair[1])
+
+
 def _safe_get_single_row(df: pd.DataFrame, where: str) -> pd.Series:
     """
     Return the first row of df if not empty, else an empty Series.
@@ -41,146 +250,232 @@ def _safe_get_single_row(df: pd.DataFrame, where: str) -> pd.Series:
     return df.iloc[0]
 
 
-def _calculate_trend(df: pd.DataFrame, time_col: str, val_col: str) -> str:
-    """
-    Determines if values are Rising, Falling, or Stable over time.
-    Uses simple linear regression slope.
+def _calculate_trends(
+    df: pd.DataFrame, label_col: str, time_col: str, val_col: str
+) -> pd.Series:
     """
-    df = df.dropna(subset=[time_col, val_col]).sort_values(time_col)
-    if len(df) < 3:
-        return "Insufficient data"
+    Determine per label whether values are Rising, Falling, or Stable
+    over time, for ALL labels in one vectorized pass.
 
-    # Convert time to numeric (seconds/hours) for regression
-    # (timestamp - min_timestamp) / 1 hour
-    x = (df[time_col] - df[time_col].min()).dt.total_seconds() / 3600.0
-    y = df[val_col].values
+    Same linear-regression rule as the old per-group helper, but the
+    per-group np.polyfit calls are replaced by the closed-form OLS
+    slope from groupby sums:
 
-    # Fit line: y = mx + c
-    # slope (m) represents change per hour
-    try:
-        slope, intercept = np.polyfit(x, y, 1)
-    except:
-        return "Stable"
-
-    # Calculate relative change over the whole period
-    total_time_hours = x.max()
-    if total_time_hours == 0:
-        return "Stable"
-    
-    total_change = slope * total_time_hours
-    start_val = (slope * x.min()) + intercept
-    
-    # Avoid division by zero
-    if start_val == 0: 
-        baseline = np.mean(y)
-    else:
-        baseline = start_val
+        slope = (n*Sxy - Sx*Sy) / (n*Sxx - Sx*Sx)
 
-    pct_change = (total_change / (baseline + 1e-9)) * 100
+    so the whole frame is reduced with segmented NumPy kernels instead
+    of a Python fit per label.
 
-    # Define thresholds (e.g., >10% change is significant)
-    if pct_change > 10:
-        return "Rising"
-    elif pct_change < -10:
-        return "Falling"
-    else:
-        return "Stable"
+    Returns a Series of trend strings indexed by label; labels with
+    fewer than 3 valid points come back as "Insufficient data".
+    """
+    data = df[[label_col, time_col, val_col]].dropna()
+    if data.empty:
+        return pd.Series(dtype="object")
+
+    # Segmented reductions on raw arrays: factorize the labels, sort
+    # the rows by group code once, then reduce every statistic with
+    # ufunc.reduceat over the group-start offsets — no per-aggregation
+    # hashing or group dispatch.
+    codes, labels = pd.factorize(data[label_col])
+    order = np.argsort(codes, kind="stable")
+    codes = codes[order]
+    tv = data[time_col].to_numpy()[order]
+    yv = data[val_col].astype(float).to_numpy()[order]
+
+    starts = np.r_[0, np.flatnonzero(np.diff(codes)) + 1]
+    counts = np.diff(np.r_[starts, codes.size])
+
+    # Hours since each label's first observation
+    t0 = np.repeat(np.minimum.reduceat(tv, starts), counts)
+    xv = (tv - t0) / np.timedelta64(1, "h")
+
+    n = counts.astype(float)
+    sx = np.add.reduceat(xv, starts)
+    sy = np.add.reduceat(yv, starts)
+    sxx = np.add.reduceat(xv * xv, starts)
+    sxy = np.add.reduceat(xv * yv, starts)
+    xmax = np.maximum.reduceat(xv, starts)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        slope = (n * sxy - sx * sy) / (n * sxx - sx * sx)
+        intercept = (sy - slope * sx) / n
+        # x starts at 0 within each group, so the fitted start value is
+        # just the intercept; fall back to the mean when it is exactly 0
+        baseline = np.where(intercept == 0, sy / n, intercept)
+        total_change = slope * xmax
+        pct_change = (total_change / (baseline + 1e-9)) * 100.0
+
+    # Thresholds as before: >10% change over the period is significant
+    trend = np.select(
+        [
+            n < 3,
+            (xmax == 0) | ~np.isfinite(pct_change),
+            pct_change > 10,
+            pct_change < -10,
+        ],
+        ["Insufficient data", "Stable", "Rising", "Falling"],
+        default="Stable",
+    )
+    return pd.Series(trend, index=pd.Index(labels))
 
 # -------------------------------------------------------------------
 # CORE LOADER
 # -------------------------------------------------------------------
 
-def load_all_tables_for_stay(stay_id: int) -> Dict[str, Any]:
+def load_all_tables_for_cohort() -> Dict[str, Any]:
     """
-    Load all relevant cohort-filtered tables for a single stay_id.
-
-    Returns a dictionary with:
-    - 'stay_id', 'hadm_id', 'subject_id'
-    - 'cohort_row' : the row from cohort_icu_250
-    - 'icu'  : dict of ICU tables for that stay
-    - 'hosp' : dict of hosp tables for that stay/hadm
-    - 'discharge_text' : full discharge summary for that hadm_id
+    Load every cohort-filtered table once, indexed by its slice key.
+
+    Returns a dict of:
+    - 'cohort' : cohort_icu_250 indexed by stay_id
+    - 'icu'    : dict of ICU tables indexed by stay_id
+    - 'hosp'   : dict of hosp tables indexed by stay_id (ICU-window
+                 tables) or hadm_id, recorded in 'hosp_keys'
+    - 'discharge' : discharge notes indexed by hadm_id
+
+    A driver looping over many stays should call this once and pass the
+    result to `load_all_tables_for_stay(stay_id, preloaded=...)`, so
+    per-stay work is just an indexed lookup per table. The underlying
+    frames are cached, so repeated calls are cheap.
     """
 
-    # 1. Load cohort and find the row for this stay_id
     cohort_path = os.path.join(COHORT_META_DIR, "cohort_icu_250.parquet")
-    cohort = pd.read_parquet(cohort_path)
 
-    if stay_id not in set(cohort["stay_id"].unique()):
-        raise ValueError(f"stay_id {stay_id} not found in cohort_icu_250")
+    def icu_table(name: str) -> pd.DataFrame:
+        path = os.path.join(ICU_PROC_COHORT_DIR, name)
+        return _read_parquet_indexed(path, "stay_id")
 
-    cohort_row = cohort[cohort["stay_id"] == stay_id].iloc[0]
-    hadm_id = int(cohort_row["hadm_id"])
-    subject_id = int(cohort_row["subject_id"])
+    def hosp_table(name: str, key: str) -> pd.DataFrame:
+        path = os.path.join(HOSP_PROC_COHORT_DIR, name)
+        return _read_parquet_indexed(path, key)
 
-    # 2. Load ICU tables (already cohort-filtered) and slice by stay_id
-    def load_icu_table(name: str) -> pd.DataFrame:
-        path = os.path.join(ICU_PROC_COHORT_DIR, name)
-        return pd.read_parquet(path)
+    # Procedures & labs ICU-window tables include stay_id; if not, fall
+    # back to hadm_id (schema peek only reads the parquet footer)
+    procs_key = _hosp_slice_key(
+        os.path.join(HOSP_PROC_COHORT_DIR, "procedures_clean_icu_250.parquet")
+    )
+    labs_key = _hosp_slice_key(
+        os.path.join(HOSP_PROC_COHORT_DIR, "lab_tests_clean_icu_250.parquet")
+    )
 
-    icustays = load_icu_table("icustays_clean_icu_250.parquet")
-    measurements = load_icu_table("measurements_clean_icu_250.parquet")
-    medications = load_icu_table("medications_clean_icu_250.parquet")
-    outputevents = load_icu_table("outputevents_clean_icu_250.parquet")
-    proc_icu = load_icu_table("procedureevents_clean_icu_250.parquet")
+    discharge_path = os.path.join(
+        NOTES_PROC_COHORT_DIR, "discharge_clean_icu_250.parquet"
+    )
 
-    icustays_this = icustays[icustays["stay_id"] == stay_id].copy()
-    measurements_this = measurements[measurements["stay_id"] == stay_id].copy()
-    medications_this = medications[medications["stay_id"] == stay_id].copy()
-    outputevents_this = outputevents[outputevents["stay_id"] == stay_id].copy()
-    proc_icu_this = proc_icu[proc_icu["stay_id"] == stay_id].copy()
+    # Fan the file loads out over threads: the parquet decode inside
+    # pyarrow releases the GIL, so a cold start costs roughly the
+    # slowest file instead of the sum. Warm calls just hit the caches.
+    loaders = {
+        "cohort": lambda: _read_parquet_indexed(cohort_path, "stay_id"),
+        "icustays": lambda: icu_table("icustays_clean_icu_250.parquet"),
+        "measurements": lambda: icu_table("measurements_clean_icu_250.parquet"),
+        "medications": lambda: _read_meds_table(
+            os.path.join(ICU_PROC_COHORT_DIR, "medications_clean_icu_250.parquet")
+        ),
+        "outputevents": lambda: icu_table("outputevents_clean_icu_250.parquet"),
+        "procedureevents": lambda: icu_table("procedureevents_clean_icu_250.parquet"),
+        "patients_admissions": lambda: hosp_table(
+            "patients_admissions_clean_icu_250.parquet", "hadm_id"
+        ),
+        "diagnoses": lambda: hosp_table("diagnoses_clean_icu_250.parquet", "hadm_id"),
+        "procedures": lambda: hosp_table("procedures_clean_icu_250.parquet", procs_key),
+        "labs": lambda: hosp_table("lab_tests_clean_icu_250.parquet", labs_key),
+        "discharge": lambda: _read_parquet_indexed(discharge_path, "hadm_id"),
+        "discharge_text_by_hadm": lambda: _discharge_text_by_hadm(discharge_path),
+    }
+    with ThreadPoolExecutor(max_workers=len(loaders)) as ex:
+        futures = {name: ex.submit(fn) for name, fn in loaders.items()}
+        tables = {name: f.result() for name, f in futures.items()}
 
-    icu_tables = {
-        "icustays": icustays_this,
-        "measurements": measurements_this,
-        "medications": medications_this,
-        "outputevents": outputevents_this,
-        "procedureevents": proc_icu_this,
+    return {
+        "cohort": tables["cohort"],
+        "icu": {
+            "icustays": tables["icustays"],
+            "measurements": tables["measurements"],
+            "medications": tables["medications"],
+            "outputevents": tables["outputevents"],
+            "procedureevents": tables["procedureevents"],
+        },
+        "hosp": {
+            "patients_admissions": tables["patients_admissions"],
+            "diagnoses": tables["diagnoses"],
+            "procedures": tables["procedures"],
+            "labs": tables["labs"],
+        },
+        "hosp_keys": {
+            "patients_admissions": "hadm_id",
+            "diagnoses": "hadm_id",
+            "procedures": procs_key,
+            "labs": labs_key,
+        },
+        "discharge": tables["discharge"],
+        "discharge_text_by_hadm": tables["discharge_text_by_hadm"],
     }
 
-    # 3. Load hosp tables (cohort-filtered) and slice by hadm_id / stay_id
-    def load_hosp_table(name: str) -> pd.DataFrame:
-        path = os.path.join(HOSP_PROC_COHORT_DIR, name)
-        return pd.read_parquet(path)
 
-    patadm = load_hosp_table("patients_admissions_clean_icu_250.parquet")
-    diagnoses = load_hosp_table("diagnoses_clean_icu_250.parquet")
-    procedures = load_hosp_table("procedures_clean_icu_250.parquet")
-    labs = load_hosp_table("lab_tests_clean_icu_250.parquet")
+def _load_single_stay(stay_id: int) -> Dict[str, Any]:
+    """
+    One-off load of a single stay via row-group pruning.
 
-    patadm_this = patadm[patadm["hadm_id"] == hadm_id].copy()
-    dx_this = diagnoses[diagnoses["hadm_id"] == hadm_id].copy()
+    Used when no preloaded cohort dict is supplied (debug scripts, the
+    Streamlit app): instead of decoding every cohort table in full,
+    each table is read through the statistics-pruned reader, touching
+    only the row groups that can contain this stay/hadm.
+    """
+    cohort_path = os.path.join(COHORT_META_DIR, "cohort_icu_250.parquet")
+    cohort = _read_parquet_indexed(cohort_path, "stay_id")
+    if stay_id not in cohort.index:
+        raise ValueError(f"stay_id {stay_id} not found in cohort_icu_250")
 
-    # Procedures & labs ICU-window tables include stay_id; if not, fall back to hadm_id
-    if "stay_id" in procedures.columns:
-        procs_this = procedures[procedures["stay_id"] == stay_id].copy()
-    else:
-        procs_this = procedures[procedures["hadm_id"] == hadm_id].copy()
+    cohort_row = cohort.loc[[stay_id]].iloc[0]
+    hadm_id = int(cohort_row["hadm_id"])
+    subject_id = int(cohort_row["subject_id"])
 
-    if "stay_id" in labs.columns:
-        labs_this = labs[labs["stay_id"] == stay_id].copy()
-    else:
-        labs_this = labs[labs["hadm_id"] == hadm_id].copy()
+    def icu_rows(name: str) -> pd.DataFrame:
+        path = os.path.join(ICU_PROC_COHORT_DIR, name)
+        return _read_rows_for_key(path, "stay_id", stay_id).copy()
 
-    hosp_tables = {
-        "patients_admissions": patadm_this,
-        "diagnoses": dx_this,
-        "procedures": procs_this,
-        "labs": labs_this,
-    }
+    def hosp_rows(name: str) -> pd.DataFrame:
+        path = os.path.join(HOSP_PROC_COHORT_DIR, name)
+        key = _hosp_slice_key(path)
+        value = stay_id if key == "stay_id" else hadm_id
+        return _read_rows_for_key(path, key, value).copy()
 
-    # 4. Load discharge summary (cohort-filtered)
     discharge_path = os.path.join(
         NOTES_PROC_COHORT_DIR, "discharge_clean_icu_250.parquet"
     )
-    discharge = pd.read_parquet(discharge_path)
-    disc_this = discharge[discharge["hadm_id"] == hadm_id].copy()
+
+    icu_files = {
+        "icustays": "icustays_clean_icu_250.parquet",
+        "measurements": "measurements_clean_icu_250.parquet",
+        "medications": "medications_clean_icu_250.parquet",
+        "outputevents": "outputevents_clean_icu_250.parquet",
+        "procedureevents": "procedureevents_clean_icu_250.parquet",
+    }
+    hosp_files = {
+        "patients_admissions": "patients_admissions_clean_icu_250.parquet",
+        "diagnoses": "diagnoses_clean_icu_250.parquet",
+        "procedures": "procedures_clean_icu_250.parquet",
+        "labs": "lab_tests_clean_icu_250.parquet",
+    }
+
+    # Issue all per-table reads concurrently; each one is mostly I/O
+    # plus GIL-releasing parquet decode, so wall time is the slowest
+    # file rather than the sum of all ten
+    n_jobs = len(icu_files) + len(hosp_files) + 1
+    with ThreadPoolExecutor(max_workers=n_jobs) as ex:
+        icu_futures = {n: ex.submit(icu_rows, f) for n, f in icu_files.items()}
+        hosp_futures = {n: ex.submit(hosp_rows, f) for n, f in hosp_files.items()}
+        disc_future = ex.submit(_read_rows_for_key, discharge_path, "hadm_id", hadm_id)
+
+        icu_tables = {n: f.result() for n, f in icu_futures.items()}
+        hosp_tables = {n: f.result() for n, f in hosp_futures.items()}
+        disc_this = disc_future.result()
 
     if len(disc_this) == 0:
         discharge_text = ""
     else:
-        # We enforce exactly 1 discharge note per hadm_id in cohort building,
-        # but still just take the first row defensively.
         discharge_text = str(disc_this.iloc[0].get("text", ""))
 
     return {
@@ -194,6 +489,70 @@ def load_all_tables_for_stay(stay_id: int) -> Dict[str, Any]:
     }
 
 
+def load_all_tables_for_stay(
+    stay_id: int, preloaded: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Load all relevant cohort-filtered tables for a single stay_id.
+
+    `preloaded` is the dict returned by `load_all_tables_for_cohort()`;
+    pass it explicitly when looping over many stays. Single-stay calls
+    may omit it and get the row-group-pruned one-off path instead.
+
+    Returns a dictionary with:
+    - 'stay_id', 'hadm_id', 'subject_id'
+    - 'cohort_row' : the row from cohort_icu_250
+    - 'icu'  : dict of ICU tables for that stay
+    - 'hosp' : dict of hosp tables for that stay/hadm
+    - 'discharge_text' : full discharge summary for that hadm_id
+    """
+
+    if preloaded is None:
+        return _load_single_stay(stay_id)
+
+    # 1. Find the cohort row for this stay_id
+    cohort = preloaded["cohort"]
+    if stay_id not in cohort.index:
+        raise ValueError(f"stay_id {stay_id} not found in cohort_icu_250")
+
+    cohort_row = cohort.loc[[stay_id]].iloc[0]
+    hadm_id = int(cohort_row["hadm_id"])
+    subject_id = int(cohort_row["subject_id"])
+
+    # 2. Slice ICU tables (already cohort-filtered) by stay_id. These
+    #    slices keep the one defensive .copy(): some consumers (e.g.
+    #    visuals.py) write helper columns into them in place, and that
+    #    must not leak into the shared cached frames.
+    icu_tables = {
+        name: _rows_for(table, stay_id).copy()
+        for name, table in preloaded["icu"].items()
+    }
+
+    # 3. Slice hosp tables by their key (stay_id for ICU-window tables,
+    #    hadm_id otherwise)
+    hosp_keys = preloaded["hosp_keys"]
+    hosp_tables = {
+        name: _rows_for(
+            table, stay_id if hosp_keys[name] == "stay_id" else hadm_id
+        ).copy()
+        for name, table in preloaded["hosp"].items()
+    }
+
+    # 4. Look up the discharge summary (cohort-filtered): an O(1) hash
+    #    get on the precomputed text map
+    discharge_text = preloaded["discharge_text_by_hadm"].get(hadm_id, "")
+
+    return {
+        "stay_id": stay_id,
+        "hadm_id": hadm_id,
+        "subject_id": subject_id,
+        "cohort_row": cohort_row,
+        "icu": icu_tables,
+        "hosp": hosp_tables,
+        "discharge_text": discharge_text,
+    }
+
+
 # -------------------------------------------------------------------
 # VIEW: DEMOGRAPHICS / ADMISSION
 # -------------------------------------------------------------------
@@ -215,7 +574,7 @@ def build_view_demographics(stay_data: Dict[str, Any]) -> Dict[str, Any]:
     - deathdate
     """
 
-    patadm = stay_data["hosp"]["patients_admissions"].copy()
+    patadm = stay_data["hosp"]["patients_admissions"]
     row = _safe_get_single_row(patadm, "patients_admissions")
 
     def get_safe(col: str, default=None):
@@ -261,7 +620,7 @@ def build_view_diagnoses(stay_data: Dict[str, Any], max_diagnoses: int = 15) ->
         }
     """
 
-    dx = stay_data["hosp"]["diagnoses"].copy()
+    dx = stay_data["hosp"]["diagnoses"]
 
     if "dx_long_title" not in dx.columns:
         return {"diagnoses": []}
@@ -270,18 +629,19 @@ def build_view_diagnoses(stay_data: Dict[str, Any], max_diagnoses: int = 15) ->
     if "dx_seq_num" in dx.columns:
         dx_sorted = dx.sort_values(["hadm_id", "dx_seq_num"])
     else:
-        dx_sorted = dx.copy()
+        dx_sorted = dx
 
-    diagnoses_list: List[Dict[str, Any]] = []
-    for _, r in dx_sorted.iterrows():
-        diagnoses_list.append(
-            {
-                "sequence": r.get("dx_seq_num"),
-                "title": r.get("dx_long_title"),
-            }
-        )
+    # Slice first, then convert columnar -> records in one shot instead
+    # of boxing every cell through iterrows()
+    head = dx_sorted.head(max_diagnoses)
+    diagnoses_list: List[Dict[str, Any]] = pd.DataFrame(
+        {
+            "sequence": head["dx_seq_num"] if "dx_seq_num" in head.columns else None,
+            "title": head["dx_long_title"],
+        },
+        index=head.index,
+    ).to_dict("records")
 
-    diagnoses_list = diagnoses_list[:max_diagnoses]
     return {"diagnoses": diagnoses_list}
 
 
@@ -305,26 +665,16 @@ def build_view_hosp_procedures(
     - procedure_chartdatetime (approximate time, if present)
     """
 
-    procs = stay_data["hosp"]["procedures"].copy()
+    procs = stay_data["hosp"]["procedures"]
     if procs.empty:
         return {"procedures_hosp": []}
 
-    # Identify key columns
-    title_col = "proc_long_title" if "proc_long_title" in procs.columns else None
-    if title_col is None:
-        # fall back to any 'long_title' or 'label' column
-        for c in procs.columns:
-            if "long_title" in c or "label" in c:
-                title_col = c
-                break
-
-    time_col = None
-    for c in procs.columns:
-        if "charttime" in c or "datetime" in c or c.endswith("_date") or c.endswith("_time"):
-            time_col = c
-            break
-
-    seq_col = "proc_seq_num" if "proc_seq_num" in procs.columns else None
+    # Identify key columns (cached per schema; falls back to any
+    # 'long_title' or 'label' column when the canonical name is absent)
+    cols = tuple(procs.columns)
+    title_col = _find_col(cols, exact="proc_long_title", pattern=r"long_title|label")
+    time_col = _find_col(cols, pattern=_TIME_PAT)
+    seq_col = _find_col(cols, exact="proc_seq_num")
 
     # Sort by sequence or time
     if seq_col is not None:
@@ -332,18 +682,18 @@ def build_view_hosp_procedures(
     elif time_col is not None:
         procs = procs.sort_values([time_col])
 
-    procedures_list: List[Dict[str, Any]] = []
-    for _, r in procs.iterrows():
-        procedures_list.append(
-            {
-                "sequence": r.get(seq_col) if seq_col is not None else None,
-                "title": r.get(title_col) if title_col is not None else None,
-                "time": r.get(time_col) if time_col is not None else None,
-            }
-        )
-
     if max_procs is not None:
-        procedures_list = procedures_list[:max_procs]
+        procs = procs.head(max_procs)
+
+    # Columnar -> records conversion instead of per-row iterrows boxing
+    procedures_list: List[Dict[str, Any]] = pd.DataFrame(
+        {
+            "sequence": procs[seq_col] if seq_col is not None else None,
+            "title": procs[title_col] if title_col is not None else None,
+            "time": procs[time_col] if time_col is not None else None,
+        },
+        index=procs.index,
+    ).to_dict("records")
 
     return {"procedures_hosp": procedures_list}
 
@@ -386,50 +736,39 @@ def build_view_icu_procedures(
         }
     """
 
-    proc_icu = stay_data["icu"]["procedureevents"].copy()
+    proc_icu = stay_data["icu"]["procedureevents"]
     if proc_icu.empty:
         return {"procedureevents": []}
 
-    label_col = "procedureevents_label" if "procedureevents_label" in proc_icu.columns else None
-    cat_col = "procedureevents_category" if "procedureevents_category" in proc_icu.columns else None
-    loc_col = "procedureevents_location" if "procedureevents_location" in proc_icu.columns else None
-    val_col = "procedureevents_value" if "procedureevents_value" in proc_icu.columns else None
-    val_uom_col = (
-        "procedureevents_valueuom" if "procedureevents_valueuom" in proc_icu.columns else None
-    )
-
-    start_col = None
-    for c in proc_icu.columns:
-        if "start" in c and ("date" in c or "time" in c):
-            start_col = c
-            break
-
-    end_col = None
-    for c in proc_icu.columns:
-        if "end" in c and ("date" in c or "time" in c):
-            end_col = c
-            break
+    cols = tuple(proc_icu.columns)
+    label_col = _find_col(cols, exact="procedureevents_label")
+    cat_col = _find_col(cols, exact="procedureevents_category")
+    loc_col = _find_col(cols, exact="procedureevents_location")
+    val_col = _find_col(cols, exact="procedureevents_value")
+    val_uom_col = _find_col(cols, exact="procedureevents_valueuom")
+    start_col = _find_col(cols, pattern=_START_PAT)
+    end_col = _find_col(cols, pattern=_END_PAT)
 
     # Sort by start time if available
     if start_col is not None:
         proc_icu = proc_icu.sort_values([start_col])
 
-    events: List[Dict[str, Any]] = []
-    for _, r in proc_icu.iterrows():
-        events.append(
-            {
-                "label": r.get(label_col) if label_col is not None else None,
-                "category": r.get(cat_col) if cat_col is not None else None,
-                "location": r.get(loc_col) if loc_col is not None else None,
-                "value": r.get(val_col) if val_col is not None else None,
-                "valueuom": r.get(val_uom_col) if val_uom_col is not None else None,
-                "start": r.get(start_col) if start_col is not None else None,
-                "end": r.get(end_col) if end_col is not None else None,
-            }
-        )
-
     if max_events is not None:
-        events = events[:max_events]
+        proc_icu = proc_icu.head(max_events)
+
+    # Columnar -> records conversion instead of per-row iterrows boxing
+    events: List[Dict[str, Any]] = pd.DataFrame(
+        {
+            "label": proc_icu[label_col] if label_col is not None else None,
+            "category": proc_icu[cat_col] if cat_col is not None else None,
+            "location": proc_icu[loc_col] if loc_col is not None else None,
+            "value": proc_icu[val_col] if val_col is not None else None,
+            "valueuom": proc_icu[val_uom_col] if val_uom_col is not None else None,
+            "start": proc_icu[start_col] if start_col is not None else None,
+            "end": proc_icu[end_col] if end_col is not None else None,
+        },
+        index=proc_icu.index,
+    ).to_dict("records")
 
     return {"procedureevents_summary": events}  
 
@@ -459,114 +798,103 @@ def build_view_labs(stay_data: Dict[str, Any], max_labs: int = 10) -> Dict[str,
     Build the 'labs-only' view for a stay.
     Now includes Trend calculation and cleaner Unit extraction.
     """
-    labs = stay_data["hosp"]["labs"].copy()
+    labs = stay_data["hosp"]["labs"]
     if labs.empty:
         return {"labs_summary": []}
 
-    # Identify key columns
-    label_col = None
-    for c in labs.columns:
-        if c == "lab_tests_label" or (c.endswith("label") and "lab_tests_" in c):
-            label_col = c
-            break
-
-    val_col = None
-    for c in labs.columns:
-        if "valuenum" in c:
-            val_col = c
-            break
-
-    # Identify unit column
-    unit_col = None
-    for c in labs.columns:
-        if "valueuom" in c:
-            unit_col = c
-            break
-
-    warning_col = None
-    for c in labs.columns:
-        if "warning" in c:
-            warning_col = c
-            break
-
-    fluid_col = "lab_tests_fluid" if "lab_tests_fluid" in labs.columns else None
-    cat_col = "lab_tests_category" if "lab_tests_category" in labs.columns else None
-
-    # Identify time column for trends
-    time_col = None
-    for c in labs.columns:
-        if "charttime" in c or "datetime" in c or c.endswith("_time") or c.endswith("_date"):
-            time_col = c
-            break
+    # Identify key columns (cached per schema)
+    cols = tuple(labs.columns)
+    label_col = _find_col(
+        cols, exact="lab_tests_label", pattern=r"\A(?=.*lab_tests_).*label$"
+    )
+    val_col = _find_col(cols, pattern=r"valuenum")
+    unit_col = _find_col(cols, pattern=r"valueuom")
+    warning_col = _find_col(cols, pattern=r"warning")
+    fluid_col = _find_col(cols, exact="lab_tests_fluid")
+    cat_col = _find_col(cols, exact="lab_tests_category")
+    # Time column for trends
+    time_col = _find_col(cols, pattern=_TIME_PAT)
 
     if label_col is None or val_col is None:
         return {"labs_summary": []}
 
-    labs[val_col] = pd.to_numeric(labs[val_col], errors="coerce")
-
+    # Coerce via assign instead of in-place writes: only the touched
+    # columns are new, the rest of the frame is shared (no full copy)
+    updates = {
+        val_col: pd.to_numeric(labs[val_col], errors="coerce"),
+        # Categorical label keys: group dispatch hashes small int codes
+        # instead of strings
+        label_col: labs[label_col].astype("category"),
+    }
     if warning_col is not None:
-        labs[warning_col] = pd.to_numeric(labs[warning_col], errors="coerce").fillna(0)
+        updates[warning_col] = pd.to_numeric(labs[warning_col], errors="coerce").fillna(0)
+    labs = labs.assign(**updates)
 
-    grouped = labs.groupby(label_col)
-    labs_summary: List[Dict[str, Any]] = []
+    # Trends for every label in one vectorized pass
+    if time_col is not None:
+        trends = _calculate_trends(labs, label_col, time_col, val_col)
+    else:
+        trends = pd.Series(dtype="object")
 
-    for label, group in grouped:
-        vals = group[val_col].dropna()
-        if len(vals) == 0:
-            continue
+    # One aggregation pass per statistic instead of a Python loop over
+    # groups: every reduction below runs in pandas' C groupby kernels
+    g = labs.groupby(label_col, sort=False, observed=True)
+    stats = g[val_col].agg(valid="count", min="min", max="max", median="median")
+    stats["count"] = g.size()
 
-        count = len(group)
-        min_val = vals.min()
-        max_val = vals.max()
-        median_val = vals.median()
-
-        if warning_col is not None:
-            abnormal_count = int((group[warning_col] == 1).sum())
-        else:
-            abnormal_count = 0
-
-        # 1. Extract Unit (Mode)
-        unit = None
-        if unit_col is not None and unit_col in group.columns:
-            uoms = group[unit_col].dropna()
-            if not uoms.empty:
-                unit = uoms.mode().iloc[0]
-
-        # 2. Calculate Trend
-        trend = "Unknown"
-        if time_col is not None and time_col in group.columns:
-            trend = _calculate_trend(group, time_col, val_col)
-
-        fluid = (
-            _first_non_null(group[fluid_col]) if fluid_col is not None and fluid_col in group.columns else None
-        )
-        category = (
-            _first_non_null(group[cat_col]) if cat_col is not None and cat_col in group.columns else None
+    if warning_col is not None:
+        stats["abnormal_count"] = (
+            labs[warning_col].eq(1).groupby(labs[label_col], observed=True).sum()
         )
+    else:
+        stats["abnormal_count"] = 0
 
-        labs_summary.append(
-            {
-                "lab_name": str(label),
-                "fluid": None if pd.isna(fluid) else fluid,
-                "category": None if pd.isna(category) else category,
-                "count": int(count),
-                "abnormal_count": abnormal_count,
-                "min": float(min_val),
-                "max": float(max_val),
-                "median": float(median_val),
-                "unit": unit,   # <--- Added
-                "trend": trend, # <--- Added
-            }
-        )
+    # Unit (dominant value), fluid/category (first non-null)
+    stats["unit"] = (
+        _dominant_per_label(labs, label_col, unit_col) if unit_col is not None else None
+    )
+    stats["fluid"] = g[fluid_col].first() if fluid_col is not None else None
+    stats["category"] = g[cat_col].first() if cat_col is not None else None
 
-    # Sort by abnormal_count (desc), then by count
-    labs_summary = sorted(
-        labs_summary,
-        key=lambda x: (x["abnormal_count"], x["count"]),
-        reverse=True,
+    if time_col is not None:
+        stats["trend"] = trends.reindex(stats.index).fillna("Insufficient data")
+    else:
+        stats["trend"] = "Unknown"
+
+    # Keep only labels with at least one numeric value, then sort by
+    # abnormal_count (desc), then by count, and cap at max_labs
+    stats = (
+        stats[stats["valid"] > 0]
+        .sort_values(["abnormal_count", "count"], ascending=False, kind="stable")
+        .head(max_labs)
+        .copy()
     )
 
-    return {"labs_summary": labs_summary[:max_labs]}
+    # Plain Python scalars in the records, as before
+    stats["lab_name"] = stats.index.astype(str)
+    stats["count"] = stats["count"].map(int)
+    stats["abnormal_count"] = stats["abnormal_count"].map(int)
+    for c in ("min", "max", "median"):
+        stats[c] = stats[c].map(float)
+    for c in ("fluid", "category", "unit"):
+        stats[c] = stats[c].astype(object).where(stats[c].notna(), None)
+
+    labs_summary: List[Dict[str, Any]] = stats[
+        [
+            "lab_name",
+            "fluid",
+            "category",
+            "count",
+            "abnormal_count",
+            "min",
+            "max",
+            "median",
+            "unit",
+            "trend",
+        ]
+    ].to_dict("records")
+
+    return {"labs_summary": labs_summary}
 
 
 # -------------------------------------------------------------------
@@ -578,119 +906,112 @@ def build_view_meds(stay_data: Dict[str, Any], max_meds: int = 10) -> Dict[str,
     Build the 'meds-only' view for a stay.
     UPDATED: Performs 'Safe Summation' by only summing amounts that match the dominant unit.
     """
-    meds = stay_data["icu"]["medications"].copy()
+    meds = stay_data["icu"]["medications"]
     if meds.empty:
         return {"meds_summary": []}
 
-    # Identify label col
-    label_col = None
-    for c in meds.columns:
-        if c == "medications_label" or (c.endswith("label") and "medications_" in c):
-            label_col = c
-            break
+    # Identify key columns (cached per schema); label falls back to any
+    # 'label' column when the canonical name is absent
+    cols = tuple(meds.columns)
+    label_col = _find_col(
+        cols, exact="medications_label", pattern=r"\A(?=.*medications_).*label$"
+    )
     if label_col is None:
-        for c in meds.columns:
-            if "label" in c:
-                label_col = c
-                break
+        label_col = _find_col(cols, pattern=r"label")
 
     if label_col is None:
         return {"meds_summary": []}
 
-    cat_col = "medications_category" if "medications_category" in meds.columns else None
+    cat_col = _find_col(cols, exact="medications_category")
+    amount_col = _find_col(cols, pattern=r"\A(?!.*original)(?!.*uom)(?=.*amount)")
+    amount_uom_col = _find_col(cols, pattern=r"\A(?!.*original)(?=.*amountuom)")
+    start_col = _find_col(cols, pattern=_START_PAT)
+    end_col = _find_col(cols, pattern=_END_PAT)
 
-    # Identify amount & unit columns
-    amount_col = None
-    for c in meds.columns:
-        if "amount" in c and "original" not in c and "uom" not in c:
-            amount_col = c
-            break
-    
-    amount_uom_col = None
-    for c in meds.columns:
-        if "amountuom" in c and "original" not in c:
-            amount_uom_col = c
-            break
-
-    # Identify time columns
-    start_col = None
-    for c in meds.columns:
-        if "start" in c and ("date" in c or "time" in c):
-            start_col = c
-            break
-    end_col = None
-    for c in meds.columns:
-        if "end" in c and ("date" in c or "time" in c):
-            end_col = c
-            break
-
-    grouped = meds.groupby(label_col)
-    meds_summary: List[Dict[str, Any]] = []
-
-    for label, group in grouped:
-        count = len(group)
+    # Categorical label keys: group dispatch hashes small int codes
+    # instead of strings
+    meds = meds.assign(**{label_col: meds[label_col].astype("category")})
 
-        # Category (take most frequent)
-        category = None
-        if cat_col is not None and cat_col in group.columns:
-            non_null = group[cat_col].dropna()
-            category = non_null.mode().iloc[0] if not non_null.empty else None
+    # One aggregation pass per statistic instead of a Python loop over
+    # groups; the reductions all run in pandas' C groupby kernels
+    g = meds.groupby(label_col, sort=False, observed=True)
+    stats = pd.DataFrame({"num_orders": g.size()})
 
-        # --- SAFE SUMMATION LOGIC ---
-        total_amount = None
-        unit = None
+    # Category and Dominant Unit (most frequent non-null)
+    stats["category"] = (
+        _dominant_per_label(meds, label_col, cat_col) if cat_col is not None else None
+    )
+    stats["unit"] = (
+        _dominant_per_label(meds, label_col, amount_uom_col)
+        if amount_uom_col is not None
+        else None
+    )
 
-        # 1. Determine the Dominant Unit (Mode)
-        if amount_uom_col is not None and amount_uom_col in group.columns:
-            uoms = group[amount_uom_col].dropna()
-            if not uoms.empty:
-                unit = uoms.mode().iloc[0]
-        
-        # 2. Sum ONLY rows that match the dominant unit
-        if amount_col is not None and amount_col in group.columns:
-            # If we found a unit, filter by it
-            if unit is not None and amount_uom_col in group.columns:
-                mask = group[amount_uom_col] == unit
-                vals = pd.to_numeric(group.loc[mask, amount_col], errors="coerce").dropna()
-            else:
-                # Fallback: if no unit info exists, sum everything (legacy behavior)
-                vals = pd.to_numeric(group[amount_col], errors="coerce").dropna()
-            
-            if not vals.empty:
-                total_amount = float(vals.sum())
+    # --- SAFE SUMMATION LOGIC ---
+    # Sum ONLY rows that match each label's dominant unit; labels with
+    # no unit info at all fall back to summing everything (legacy
+    # behavior). min_count=1 leaves labels without any numeric amount
+    # as NaN -> None.
+    if amount_col is not None:
+        amounts = pd.to_numeric(meds[amount_col], errors="coerce")
+        if amount_uom_col is not None:
+            dominant = meds[label_col].map(stats["unit"])
+            amounts = amounts.where(
+                meds[amount_uom_col].eq(dominant) | dominant.isna()
+            )
+        stats["total_amount"] = amounts.groupby(meds[label_col], observed=True).sum(
+            min_count=1
+        )
+    else:
+        stats["total_amount"] = None
 
-        # Start/end times
-        start_min = None
-        end_max = None
-        if start_col is not None and start_col in group.columns:
-            start_times = pd.to_datetime(group[start_col], errors="coerce")
-            if not start_times.dropna().empty:
-                start_min = start_times.min()
-        if end_col is not None and end_col in group.columns:
-            end_times = pd.to_datetime(group[end_col], errors="coerce")
-            if not end_times.dropna().empty:
-                end_max = end_times.max()
+    # Start/end times. The batch loader already parsed these columns to
+    # datetimes; only re-coerce if a raw string column slipped through
+    # (e.g. the one-off single-stay path).
+    if start_col is not None:
+        start_times = meds[start_col]
+        if not pd.api.types.is_datetime64_any_dtype(start_times):
+            start_times = pd.to_datetime(start_times, errors="coerce")
+        stats["first_start"] = start_times.groupby(meds[label_col], observed=True).min()
+    else:
+        stats["first_start"] = None
+    if end_col is not None:
+        end_times = meds[end_col]
+        if not pd.api.types.is_datetime64_any_dtype(end_times):
+            end_times = pd.to_datetime(end_times, errors="coerce")
+        stats["last_end"] = end_times.groupby(meds[label_col], observed=True).max()
+    else:
+        stats["last_end"] = None
 
-        meds_summary.append(
-            {
-                "med_name": str(label),
-                "category": None if pd.isna(category) else category,
-                "num_orders": int(count),
-                "total_amount": total_amount,
-                "unit": unit,
-                "first_start": start_min,
-                "last_end": end_max,
-            }
-        )
+    # Sort: more frequently used meds first, capped at max_meds
+    stats = (
+        stats.sort_values("num_orders", ascending=False, kind="stable")
+        .head(max_meds)
+        .copy()
+    )
 
-    # Sort: more frequently used meds first
-    meds_summary = sorted(
-        meds_summary,
-        key=lambda x: x["num_orders"],
-        reverse=True,
+    # Plain Python scalars in the records, as before
+    stats["med_name"] = stats.index.astype(str)
+    stats["num_orders"] = stats["num_orders"].map(int)
+    stats["total_amount"] = stats["total_amount"].map(
+        lambda v: None if pd.isna(v) else float(v)
     )
+    for c in ("category", "unit", "first_start", "last_end"):
+        stats[c] = stats[c].astype(object).where(stats[c].notna(), None)
+
+    meds_summary: List[Dict[str, Any]] = stats[
+        [
+            "med_name",
+            "category",
+            "num_orders",
+            "total_amount",
+            "unit",
+            "first_start",
+            "last_end",
+        ]
+    ].to_dict("records")
 
-    return {"meds_summary": meds_summary[:max_meds]}
+    return {"meds_summary": meds_summary}
 
 
 """
@@ -814,97 +1135,81 @@ def build_view_measurements(
     Build the 'measurements-only' view for a stay.
     Now includes Unit extraction and Trend calculation.
     """
-    meas = stay_data["icu"]["measurements"].copy()
+    meas = stay_data["icu"]["measurements"]
     if meas.empty:
         return {"measurements_summary": []}
 
-    # Identify label column
-    label_col = None
-    for c in meas.columns:
-        if c == "measurements_label" or (c.endswith("label") and "measurements_" in c):
-            label_col = c
-            break
+    # Identify key columns (cached per schema); label falls back to any
+    # 'label' column when the canonical name is absent
+    cols = tuple(meas.columns)
+    label_col = _find_col(
+        cols, exact="measurements_label", pattern=r"\A(?=.*measurements_).*label$"
+    )
     if label_col is None:
-        for c in meas.columns:
-            if "label" in c:
-                label_col = c
-                break
-
-    # Identify value column
-    val_col = None
-    for c in meas.columns:
-        if "valuenum" in c:
-            val_col = c
-            break
-    
-    # Identify unit column
-    val_uom_col = None
-    for c in meas.columns:
-        if "valueuom" in c:
-            val_uom_col = c
-            break
+        label_col = _find_col(cols, pattern=r"label")
 
-    # Identify time column (critical for trends)
-    time_col = None
-    for c in meas.columns:
-        if "charttime" in c or "datetime" in c or c.endswith("_time") or c.endswith("_date"):
-            time_col = c
-            break
+    val_col = _find_col(cols, pattern=r"valuenum")
+    val_uom_col = _find_col(cols, pattern=r"valueuom")
+    # Time column (critical for trends)
+    time_col = _find_col(cols, pattern=_TIME_PAT)
 
     if label_col is None or val_col is None:
         return {"measurements_summary": []}
 
-    meas[val_col] = pd.to_numeric(meas[val_col], errors="coerce")
+    # assign over in-place write: keeps the caller's frame untouched
+    # without copying every column. Categorical label keys make the
+    # groupby dispatch hash small int codes instead of strings.
+    meas = meas.assign(**{
+        val_col: pd.to_numeric(meas[val_col], errors="coerce"),
+        label_col: meas[label_col].astype("category"),
+    })
 
     # Optionally focus on the most frequent measurement labels for this stay
     label_counts = meas[label_col].value_counts()
     top_labels = label_counts.head(max_labels).index.tolist()
     meas = meas[meas[label_col].isin(top_labels)]
 
-    grouped = meas.groupby(label_col)
-    measurements_summary: List[Dict[str, Any]] = []
+    # Trends for every label in one vectorized pass
+    if time_col is not None:
+        trends = _calculate_trends(meas, label_col, time_col, val_col)
+    else:
+        trends = pd.Series(dtype="object")
+
+    # One aggregation pass per statistic instead of a Python loop over
+    # groups; the reductions all run in pandas' C groupby kernels
+    g = meas.groupby(label_col, sort=False, observed=True)
+    stats = g[val_col].agg(valid="count", min="min", max="max", median="median")
+    stats["count"] = g.size()
+
+    # Unit (dominant value)
+    stats["unit"] = (
+        _dominant_per_label(meas, label_col, val_uom_col)
+        if val_uom_col is not None
+        else None
+    )
 
-    for label, group in grouped:
-        vals = group[val_col].dropna()
-        if len(vals) == 0:
-            continue
+    if time_col is not None:
+        stats["trend"] = trends.reindex(stats.index).fillna("Insufficient data")
+    else:
+        stats["trend"] = "Unknown"
 
-        count = len(group)
-        min_val = vals.min()
-        max_val = vals.max()
-        median_val = vals.median()
-        
-        # 1. Extract Unit (Mode)
-        unit = None
-        if val_uom_col is not None and val_uom_col in group.columns:
-            uoms = group[val_uom_col].dropna()
-            if not uoms.empty:
-                unit = uoms.mode().iloc[0]
-
-        # 2. Calculate Trend
-        trend = "Unknown"
-        if time_col is not None and time_col in group.columns:
-            # Uses the helper function you added: _calculate_trend
-            trend = _calculate_trend(group, time_col, val_col)
+    # Keep only labels with at least one numeric value, sorted by count
+    stats = (
+        stats[stats["valid"] > 0]
+        .sort_values("count", ascending=False, kind="stable")
+        .copy()
+    )
 
-        measurements_summary.append(
-            {
-                "measure_name": str(label),
-                "count": int(count),
-                "min": float(min_val),
-                "max": float(max_val),
-                "median": float(median_val),
-                "unit": unit,   # <--- Added
-                "trend": trend, # <--- Added
-            }
-        )
+    # Plain Python scalars in the records, as before
+    stats["measure_name"] = stats.index.astype(str)
+    stats["count"] = stats["count"].map(int)
+    for c in ("min", "max", "median"):
+        stats[c] = stats[c].map(float)
+    stats["unit"] = stats["unit"].astype(object).where(stats["unit"].notna(), None)
 
-    # Sort by count
-    measurements_summary = sorted(
-        measurements_summary,
-        key=lambda x: x["count"],
-        reverse=True,
-    )
+    measurements_summary: List[Dict[str, Any]] = stats[
+        ["measure_name", "count", "min", "max", "median", "unit", "trend"]
+    ].to_dict("records")
 
     return {"measurements_summary": measurements_summary}
 
@@ -1027,33 +1332,23 @@ def build_view_outputs(
     - optional trend
     """
 
-    out = stay_data["icu"]["outputevents"].copy()
+    out = stay_data["icu"]["outputevents"]
     if out.empty:
         return {"outputs_summary": []}
 
-    label_col = "outputevents_label" if "outputevents_label" in out.columns else None
-    if label_col is None:
-        for c in out.columns:
-            if "label" in c:
-                label_col = c
-                break
-
-    cat_col = "outputevents_category" if "outputevents_category" in out.columns else None
-    val_col = "outputevents_value" if "outputevents_value" in out.columns else None
-    val_uom_col = (
-        "outputevents_valueuom" if "outputevents_valueuom" in out.columns else None
-    )
-
-    time_col = None
-    for c in out.columns:
-        if "charttime" in c or "datetime" in c or c.endswith("_time") or c.endswith("_date"):
-            time_col = c
-            break
+    cols = tuple(out.columns)
+    label_col = _find_col(cols, exact="outputevents_label", pattern=r"label")
+    cat_col = _find_col(cols, exact="outputevents_category")
+    val_col = _find_col(cols, exact="outputevents_value")
+    val_uom_col = _find_col(cols, exact="outputevents_valueuom")
+    time_col = _find_col(cols, pattern=_TIME_PAT)
 
     if label_col is None or val_col is None:
         return {"outputs_summary": []}
 
-    out[val_col] = pd.to_numeric(out[val_col], errors="coerce")
+    # assign over in-place write: keeps the caller's frame untouched
+    # without copying every column
+    out = out.assign(**{val_col: pd.to_numeric(out[val_col], errors="coerce")})
 
     grouped = out.groupby(label_col)
 
@@ -1155,4 +1450,49 @@ def build_view_admission(stay_data: Dict[str, Any]) -> Dict[str, Any]:
     return {
         "demographics": demo_view.get("demographics", {}),
         "diagnoses": dx_view.get("diagnoses", []),
-    }
\ No newline at end of file
+    }
+
+
+# -------------------------------------------------------------------
+# COHORT-WIDE DRIVER
+# -------------------------------------------------------------------
+
+
+def build_all_views(stay_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Build every view for one loaded stay, merged into a single dict."""
+    views: Dict[str, Any] = {}
+    views.update(build_view_demographics(stay_data))
+    views.update(build_view_diagnoses(stay_data))
+    views.update(build_view_hosp_procedures(stay_data))
+    views.update(build_view_icu_procedures(stay_data))
+    views.update(build_view_labs(stay_data))
+    views.update(build_view_meds(stay_data))
+    views.update(build_view_measurements(stay_data))
+    views.update(build_view_outputs(stay_data))
+    return views
+
+
+def build_views_for_cohort(
+    stay_ids: Optional[List[int]] = None, max_workers: Optional[int] = None
+) -> Dict[int, Dict[str, Any]]:
+    """
+    Build every view for many stays in parallel.
+
+    Loads the cohort tables once, then fans the per-stay work out over
+    a thread pool: the heavy lifting inside the views is pandas/NumPy
+    C code that releases the GIL, and threads share `preloaded`
+    directly instead of pickling it per worker. Defaults to every
+    stay_id in the cohort. Returns {stay_id: views dict}.
+    """
+    preloaded = load_all_tables_for_cohort()
+    if stay_ids is None:
+        stay_ids = [int(s) for s in preloaded["cohort"].index]
+
+    def one_stay(stay_id: int) -> Dict[str, Any]:
+        stay_data = load_all_tables_for_stay(stay_id, preloaded=preloaded)
+        return build_all_views(stay_data)
+
+    with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as ex:
+        results = list(ex.map(one_stay, stay_ids))
+
+    return dict(zip(stay_ids, results))
\ No newline at end of file
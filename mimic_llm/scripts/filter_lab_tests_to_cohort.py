@@ -46,8 +46,13 @@ def main():
 
     labs_window = merged[mask].copy()
 
+    # Sort by stay_id and write small row groups so the per-row-group
+    # min/max statistics are tight: readers can then serve one stay by
+    # decoding only the row groups whose stats range covers it
+    labs_window = labs_window.sort_values("stay_id", kind="stable")
+
     out_path = os.path.join(HOSP_PROC_COHORT_DIR, "lab_tests_clean_icu_250.parquet")
-    labs_window.to_parquet(out_path, index=False)
+    labs_window.to_parquet(out_path, index=False, row_group_size=64_000)
 
     print(f"Saved ICU-window lab tests to: {out_path}")
     print(f"Rows: {len(labs_window)}, Cols: {len(labs_window.columns)}")
@@ -109,7 +109,14 @@ def main():
 
     # 9. Save to processed folder as Parquet
     out_path = os.path.join(HOSP_PROC_DIR, "lab_tests_clean.parquet")
-    lab_tests.to_parquet(out_path, index=False)
+    # Pin dictionary encoding for the low-cardinality meta columns so
+    # downstream unique/count work reads the dictionary, not 158M values
+    # (pyarrow can silently fall back to plain encoding otherwise)
+    lab_tests.to_parquet(
+        out_path,
+        index=False,
+        use_dictionary=["lab_tests_label", "lab_tests_fluid", "lab_tests_category"],
+    )
 
     print(f"Saved cleaned lab tests table to: {out_path}")
     print(f"Rows: {len(lab_tests)}, Columns: {len(lab_tests.columns)}")
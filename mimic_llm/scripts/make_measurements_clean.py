@@ -91,7 +91,17 @@ def main():
 
     # 8. Save to processed folder
     out_path = os.path.join(ICU_PROC_DIR, "measurements_clean.parquet")
-    measurements.to_parquet(out_path, index=False)
+    # Pin dictionary encoding for the low-cardinality meta columns so
+    # downstream unique/count work reads the dictionary, not 433M values
+    measurements.to_parquet(
+        out_path,
+        index=False,
+        use_dictionary=[
+            "measurements_label",
+            "measurements_category",
+            "measurements_valueuom",
+        ],
+    )
 
     print(f"Saved cleaned measurements table to: {out_path}")
     print(f"Rows: {len(measurements)}, Columns: {len(measurements.columns)}")
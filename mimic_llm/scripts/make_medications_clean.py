@@ -113,7 +113,13 @@ def main():
 
     # 8. Save to processed folder
     out_path = os.path.join(ICU_PROC_DIR, "medications_clean.parquet")
-    medications.to_parquet(out_path, index=False)
+    # Pin dictionary encoding for the low-cardinality meta columns so
+    # downstream unique/count work reads the dictionary, not every row
+    medications.to_parquet(
+        out_path,
+        index=False,
+        use_dictionary=["medications_label", "medications_category"],
+    )
 
     print(f"Saved cleaned medications table to: {out_path}")
     print(f"Rows: {len(medications)}, Columns: {len(medications.columns)}")
@@ -112,7 +112,13 @@ def main():
 
     # 9. Save to processed folder
     out_path = os.path.join(ICU_PROC_DIR, "outputevents_clean.parquet")
-    output_clean.to_parquet(out_path, index=False)
+    # Pin dictionary encoding for the low-cardinality meta columns so
+    # downstream unique/count work reads the dictionary, not every row
+    output_clean.to_parquet(
+        out_path,
+        index=False,
+        use_dictionary=["outputevents_label", "outputevents_category"],
+    )
 
     print(f"Saved cleaned outputevents table to: {out_path}")
     print(f"Rows: {len(output_clean)}, Columns: {len(output_clean.columns)}")
@@ -123,7 +123,13 @@ def main():
 
     # 9. Save to processed folder
     out_path = os.path.join(ICU_PROC_DIR, "procedureevents_clean.parquet")
-    proc_clean.to_parquet(out_path, index=False)
+    # Pin dictionary encoding for the low-cardinality meta columns so
+    # downstream unique/count work reads the dictionary, not every row
+    proc_clean.to_parquet(
+        out_path,
+        index=False,
+        use_dictionary=["procedureevents_label", "procedureevents_category"],
+    )
 
     print(f"Saved cleaned procedureevents table to: {out_path}")
     print(f"Rows: {len(proc_clean)}, Columns: {len(proc_clean.columns)}")
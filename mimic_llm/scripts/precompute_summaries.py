@@ -18,6 +18,7 @@ from generator import run_generation_for_view
 from eval import compare_summaries
 
 OUTPUT_FILE = os.path.join(PROJECT_ROOT, "precomputed_cohort_summaries.json")
+OUTPUT_PARQUET = os.path.join(PROJECT_ROOT, "precomputed_cohort_summaries.parquet")
 
 # Defines the specific order for the Final Summary concatenation
 FINAL_ORDER = [
@@ -40,6 +41,27 @@ class CustomJSONEncoder(json.JSONEncoder):
             return str(obj)
         return super().default(obj)
 
+def write_parquet_store(all_data):
+    """
+    Mirror the JSON store into a Parquet table (one row per stay) so the
+    Streamlit app can read a single stay's record without parsing the
+    whole cohort file.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    stay_ids = sorted(int(k) for k in all_data.keys())
+    records = [
+        json.dumps(all_data[str(s)], cls=CustomJSONEncoder) for s in stay_ids
+    ]
+    table = pa.table({
+        "stay_id": pa.array(stay_ids, type=pa.int64()),
+        "record_json": pa.array(records, type=pa.string()),
+    })
+    # Small row groups keep per-stay reads cheap
+    pq.write_table(table, OUTPUT_PARQUET, row_group_size=10)
+
+
 def load_cohort():
     path = os.path.join(COHORT_META_DIR, "cohort_icu_250.parquet")
     df = pd.read_parquet(path)
@@ -153,7 +175,8 @@ def main():
     # Final Save for this batch
     with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
         json.dump(all_data, f, indent=2, cls=CustomJSONEncoder)
-    
+    write_parquet_store(all_data)
+
     print(f"--- BATCH COMPLETED ---")
     print(f"Total processed so far: {len(all_data)} / {len(stay_ids)}")
     if len(all_data) < len(stay_ids):